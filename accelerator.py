@@ -1,8 +1,16 @@
 from dataclasses import dataclass
 from bitstring import Bits
 from .processing_element import ProcessingElement, ProcessingElementConfiguration
+from .processing_element_array import ProcessingElementArray
 from .main_buffer import MainBuffer, MainBufferConfiguration
-from .instruction import Instruction, MemoryInstruction, ProcessingElementInstruction, MI
+from .instruction import Instruction, MemoryInstruction, ProcessingElementInstruction, MI, PEI
+from .decoded_instruction import DecodedInstruction, InstructionDecoder, InstructionLayout, stream_program
+from .profiling import Profiler
+from .pipeline import CycleModel, PipelineConfiguration
+from .result_cache import ResultCache
+from .trace_compiler import Kernel, compile_program
+from .matvec import CompiledMatvec, plan_matvec, pack_matrix_loads, pack_vector, matvec_program, unpack_outputs, wrap_to_mode
+import numpy as np
 
 
 @dataclass
@@ -39,7 +47,8 @@ class Accelerator:
     def __init__(
         self,
         controller_config : AcceleratorConfiguration,
-        default_counter_value = 0
+        default_counter_value = 0,
+        vectorized : bool = False
     ):
 
         # Saving the Configuration and Validating
@@ -49,14 +58,85 @@ class Accelerator:
         # Creating a Bit-Accurate Representation of the Counter
         self._counter = Bits(uint=default_counter_value, length=self._controller_config.COUNTER_BITWIDTH)
 
-        # Creating an Array of PEs
-        self._pe_array = [
-            ProcessingElement(self._controller_config.PE_CONFIG) for _ in range(self._controller_config.PE_COUNT)
-        ]
+        # Creating an Array of PEs, Either One Object per PE or a Single
+        # Vectorized Model of the Whole Array
+        self._vectorized = vectorized
+        if self._vectorized:
+            self._pe_array = ProcessingElementArray(self._controller_config.PE_CONFIG, self._controller_config.PE_COUNT)
+        else:
+            self._pe_array = [
+                ProcessingElement(self._controller_config.PE_CONFIG) for _ in range(self._controller_config.PE_COUNT)
+            ]
 
         # Creating a Main Buffer
         self._main_buffer = MainBuffer(self._controller_config.BUFFER_CONFIG)
 
+        # Decoded Instructions, Memoized by their Raw Bits
+        self._decoder = InstructionDecoder()
+
+        # Optional Profiler and Cycle Model, Only Hooked in when Enabled
+        self._profiler = None
+        self._cycle_model = None
+
+        # Optional On-Disk Cache of execute_instructions Results
+        self._result_cache = None
+
+        # Optional Zero Skipping: the Mask of PEs Whose Current Inputs can
+        # Change their Accumulators (None When Unknown) and Skip Counters
+        self._sparse = False
+        self._sparse_mask = None
+        self._sparse_stats = {}
+
+    def enable_profiling(self) -> Profiler:
+        if self._profiler is None:
+            self._profiler = Profiler().attach(self)
+        return self._profiler
+
+    def disable_profiling(self) -> None:
+        if self._profiler is not None:
+            self._profiler.detach()
+            self._profiler = None
+
+    def enable_cycle_model(self, config : PipelineConfiguration = None, record : bool = False) -> CycleModel:
+        # Counting RTL Cycles (Controller Dispatch Plus the PE Pipeline
+        # Register) Alongside Functional Execution
+        if self._cycle_model is None:
+            self._cycle_model = CycleModel(config, record)
+        return self._cycle_model
+
+    def disable_cycle_model(self) -> None:
+        self._cycle_model = None
+
+    def enable_result_cache(self, directory : str, max_bytes : int = 1 << 30) -> ResultCache:
+        self._result_cache = ResultCache(directory, max_bytes)
+        return self._result_cache
+
+    def disable_result_cache(self) -> None:
+        self._result_cache = None
+
+    def enable_sparse(self) -> None:
+        # Indexing Nonzero MEM0 Slices on Load and Skipping MAC Cycles (or PE
+        # Updates) Whose Products are All Zero; Results Stay Bit-Identical
+        self._main_buffer.enable_sparse_index(self._controller_config.PE_CONFIG.INPUT_BITWIDTH)
+        self._sparse = True
+        self._sparse_mask = None
+        self._sparse_stats = {"mac_cycles" : 0, "skipped_cycles" : 0, "pe_updates" : 0, "skipped_pe_updates" : 0}
+
+    def disable_sparse(self) -> None:
+        self._main_buffer.disable_sparse_index()
+        self._sparse = False
+        self._sparse_mask = None
+
+    def sparse_report(self) -> dict:
+        stats = dict(self._sparse_stats)
+        if stats:
+            stats["cycle_speedup"] = stats["mac_cycles"] / max(stats["mac_cycles"] - stats["skipped_cycles"], 1)
+            stats["pe_update_speedup"] = stats["pe_updates"] / max(stats["pe_updates"] - stats["skipped_pe_updates"], 1)
+        return stats
+
+    def enable_broadcast_tables(self, max_bytes : int = 64 << 20) -> int:
+        return self._main_buffer.enable_broadcast_tables(max_bytes)
+
     def set_memory(self, mem0 : list[Bits], mem1 : list[Bits]) -> None:
         self.set_mem0(mem0)
         self.set_mem1(mem1)
@@ -67,47 +147,330 @@ class Accelerator:
     def set_mem1(self, mem : list[Bits]) -> None:
         self._main_buffer.set_mem1_bits(mem)
 
+    def set_mem0_array(self, image : np.ndarray) -> None:
+        self._main_buffer.set_mem0_array(image)
+
+    def set_mem1_array(self, image : np.ndarray) -> None:
+        self._main_buffer.set_mem1_array(image)
+
+    def get_mem2_array(self) -> np.ndarray:
+        return self._main_buffer.read_mem2_array()
+
+    def get_mem2_delta(self) -> tuple:
+        return self._main_buffer.read_mem2_delta()
+
+    def load_memory(self, mem0_path : str, mem1_path : str) -> None:
+        self._main_buffer.load_mem0(mem0_path)
+        self._main_buffer.load_mem1(mem1_path)
+
     def get_mem2(self) -> list[Bits]:
         return self._main_buffer.read_mem2_bits()
 
-    def execute_instructions(self, instructions : list[Instruction]):
-        for inst in instructions:
-            self.execute_instruction(inst)
+    def run_matvec(self, matrix : np.ndarray, vectors : np.ndarray, mode : int, shift : int = 0) -> np.ndarray:
+        # Computing matrix @ vector for Every Vector in the Batch (One per Row
+        # of a 2-D vectors Array). Results are the mode Bit Lanes the Hardware
+        # Writes to MEM2, Optionally Rounded by shift Before OUT.
+        matrix = np.asarray(matrix, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.int64)
+        single = (vectors.ndim == 1)
+        vectors = np.atleast_2d(vectors)
+        if matrix.ndim != 2 or vectors.shape[1] != matrix.shape[1]:
+            raise ValueError(f"Matrix of shape {matrix.shape} does not match vectors of shape {vectors.shape}.")
 
-    def execute_instruction(self, instruction : Instruction):
-        # START IMPLEMENTATION
+        # Tiling and Packing the Matrix Once for the Whole Batch
+        plan = plan_matvec(self._controller_config, matrix.shape[0], matrix.shape[1], mode)
+        if shift and plan.k_chunks > 1:
+            raise ValueError(f"Rounding shift needs the full reduction ({matrix.shape[1]}) in one piece of at most {plan.k_chunk}.")
+        loads = pack_matrix_loads(self._controller_config, plan, matrix)
+        vector_images = [
+            [pack_vector(self._controller_config, plan, vector, kc) for kc in range(plan.k_chunks)]
+            for vector in vectors
+        ]
+
+        # Each MEM0 Load is Reused Across the Batch; Partial Sums of Reduction
+        # Pieces Combine Exactly Because OUT Keeps the Low mode Bits
+        results = np.zeros((len(vectors), plan.padded_rows), dtype=np.int64)
+        for t0, tiles, kc, mem0_image in loads:
+            self._main_buffer.set_mem0_array(mem0_image)
+            program = matvec_program(plan, tiles, shift)
+            rows = slice(t0 * plan.rows_per_tile, (t0 + tiles) * plan.rows_per_tile)
+            for b, images in enumerate(vector_images):
+                self._main_buffer.set_mem1_array(images[kc])
+                for decoded in program:
+                    self.execute_decoded_instruction(decoded)
+                results[b, rows] += unpack_outputs(self._controller_config, plan, self._main_buffer.read_mem2_array(), tiles)
 
-        # get instructions 
-        mem_inst = instruction.get_mem_instruction()
-        pe_inst = instruction.get_pe_instruction()
+        results = wrap_to_mode(results[:, :matrix.shape[0]], mode)
+        return results[0] if single else results
 
-        # get offsets 
-        mema_offset = mem_inst.get_mema_offset().uint
-        memb_offset = mem_inst.get_memb_offset().uint
-        mema_inc = instruction.get_mema_inc().uint
-        memb_inc = instruction.get_memb_inc().uint
-        n = instruction.get_count().uint + 1
+    def run_compiled_matvec(self, compiled : CompiledMatvec) -> np.ndarray:
+        # Running Every Load of a compile_matvec Output and Adding the Result
+        # Lanes of Each Reduction Piece, as run_matvec Does
+        plan = compiled.plan
+        results = np.zeros(plan.padded_rows, dtype=np.int64)
+        for t0, tiles, kc, mem0_image, mem1_image, program in compiled.loads:
+            self._main_buffer.set_mem0_array(mem0_image)
+            self._main_buffer.set_mem1_array(mem1_image)
+            for decoded in program:
+                self.execute_decoded_instruction(decoded)
+            rows = slice(t0 * plan.rows_per_tile, (t0 + tiles) * plan.rows_per_tile)
+            results[rows] += unpack_outputs(self._controller_config, plan, self._main_buffer.read_mem2_array(), tiles)
+        return wrap_to_mode(results[:compiled.rows], plan.mode)
 
-        for i in range(n):
-            mem_inst.set_mema_offset(mema_offset + i * mema_inc)
-            mem_inst.set_memb_offset(memb_offset + i * memb_inc)
+    def execute_instructions(self, instructions : list[Instruction], start : int = 0):
+        # Decoding Each Instruction Once (Unless Already Decoded), then Running
+        # on Plain Ints. start Resumes Part Way Through, e.g. After Restoring a
+        # Checkpoint.
+        program = instructions[start:]
+        if program and not isinstance(program[0], DecodedInstruction):
+            program = self._decoder.decode_program(program)
+
+        # Identical Runs Restore the Cached Final State Instead (Bypassed While
+        # Profiling, Counting Cycles or Counting Sparse Skips, Which Need the
+        # Execution Itself)
+        cache = self._result_cache if (self._profiler is None and self._cycle_model is None and not self._sparse) else None
+        if cache is not None:
+            key = cache.key(self._checkpoint_state(), program)
+            if cache.restore(key, self):
+                return None
+
+        for decoded in program:
+            self.execute_decoded_instruction(decoded)
+        if cache is not None:
+            cache.store(key, self)
+
+    def save_checkpoint(self, path : str, instruction_index : int = 0, memories : bool = True) -> None:
+        # Writing the Complete State to a Single .npz (Without the MEM0/MEM1
+        # Images if not memories, for Runs that Reload them Separately)
+        np.savez(path, **self._checkpoint_state(instruction_index, memories))
+
+    def _checkpoint_state(self, instruction_index : int = 0, memories : bool = True) -> dict:
+        # Counter, Every PE's Registers as (PE x bytes) Arrays, Memories and Ports
+        registers = [self._pe_registers(i) for i in range(self._controller_config.PE_COUNT)]
+        state = {
+            "config"            : np.array(repr(self._controller_config)),
+            "instruction_index" : np.array(instruction_index, dtype=np.int64),
+            "counter"           : np.frombuffer(self._counter.tobytes(), dtype=np.uint8),
+            "counter_bitwidth"  : np.array(len(self._counter), dtype=np.int64),
+        }
+        for field, column in zip(["pe_input_a", "pe_input_b", "pe_acc", "pe_output"], zip(*registers)):
+            state[field] = np.stack([np.frombuffer(value.tobytes(), dtype=np.uint8) for value in column])
+        state.update({
+            f"buffer_{name}" : value for name, value in self._main_buffer.get_state().items()
+            if memories or name not in ("mem0", "mem1")
+        })
+        return state
+
+    def load_checkpoint(self, path : str) -> int:
+        # Restoring State Saved by save_checkpoint; Returns the Saved
+        # Instruction Index so Execution can Resume From There. MEM0/MEM1 are
+        # Kept When the Checkpoint Omits Them.
+        with np.load(path) as data:
+            state = {name : data[name] for name in data.files}
+        if str(state["config"]) != repr(self._controller_config):
+            raise ValueError(f"Checkpoint {path} was saved with a different configuration.")
+
+        # Reading Every Field Before Changing Anything, so a Damaged File
+        # Leaves the Accelerator as it Was
+        counter = Bits(bytes=state["counter"].tobytes(), length=int(state["counter_bitwidth"]))
+        pe_config = self._controller_config.PE_CONFIG
+        columns = [
+            [Bits(bytes=row.tobytes(), length=width) for row in state[field]]
+            for field, width in [
+                ("pe_input_a", pe_config.INPUT_BITWIDTH),
+                ("pe_input_b", pe_config.INPUT_BITWIDTH),
+                ("pe_acc",     pe_config.ACCUMULATION_BITWIDTH),
+                ("pe_output",  pe_config.OUTPUT_BITWIDTH),
+            ]
+        ]
+        buffer_state = {name[len("buffer_"):] : value for name, value in state.items() if name.startswith("buffer_")}
+        instruction_index = int(state["instruction_index"])
+        self._main_buffer.check_state(buffer_state)
+
+        self._sparse_mask = None
+        self._counter = counter
+        if self._vectorized:
+            self._pe_array.set_registers(columns[0], columns[1][0], columns[2], columns[3])
+        else:
+            for pe, registers in zip(self._pe_array, zip(*columns)):
+                pe.set_registers(*registers)
+        self._main_buffer.set_state(buffer_state)
+        return instruction_index
+
+    def _pe_registers(self, index : int) -> tuple:
+        if self._vectorized:
+            return self._pe_array.get_registers(index)
+        return self._pe_array[index].get_registers()
+
+    def execute_stream(self, path : str, inst_config, binary : bool = None) -> int:
+        # Executing an inst.bits File as it is Read, so Memory Stays Flat
+        # Regardless of Program Length. Returns the Instructions Executed.
+        executed = 0
+        for decoded in stream_program(path, InstructionLayout(inst_config), binary):
+            self.execute_decoded_instruction(decoded)
+            executed += 1
+        return executed
+
+    def compile_kernel(self, instructions : list) -> Kernel:
+        # Specializing a Program for this Configuration and Backend
+        if instructions and not isinstance(instructions[0], DecodedInstruction):
+            instructions = self._decoder.decode_program(instructions)
+        return compile_program(self._controller_config, instructions, self._vectorized)
+
+    def run_kernel(self, kernel : Kernel) -> None:
+        # Running a Compiled Program, Restoring the Cached Final State Instead
+        # when a Result Cache Holds this Run
+        cache = self._result_cache
+        if cache is not None:
+            key = cache.key(self._checkpoint_state(), kernel.program)
+            if cache.restore(key, self):
+                return None
+        kernel(self)
+        if cache is not None:
+            cache.store(key, self)
+        return None
+
+    def execute_words(self, words : np.ndarray, layout : InstructionLayout) -> None:
+        # Executing Packed Instruction Words, e.g. from BulkAssembler
+        for word in words:
+            self.execute_decoded_instruction(layout.decode(int(word)))
+
+    def execute_decoded_instruction(self, decoded : DecodedInstruction):
+        mem_opcode = decoded.mem_opcode
+        if self._cycle_model is not None:
+            self._cycle_model.issue(decoded)
+
+        # Counted READ+MAC Runs Collapse into One Batched Gather and MAC
+        if self._vectorized and decoded.count > 0 and self._is_mac_run(decoded):
+            if self._sparse:
+                return self._sparse_mac_run(decoded)
+            a_rows, b_words = self._main_buffer.read_run(
+                decoded.mem_mode,
+                decoded.mema_offset, decoded.mema_inc,
+                decoded.memb_offset, decoded.memb_inc,
+                decoded.count + 1
+            )
+            self._pe_array.mac_run(decoded.pe_mode, a_rows, b_words)
+            return 0
+
+        # Per-Iteration Address Cursors
+        mema_offset = decoded.mema_offset
+        memb_offset = decoded.memb_offset
+
+        for _ in range(decoded.count + 1):
 
             # if write, go to MEM2
-            if mem_inst.get_opcode().uint == MI.WRITE:
-                joined = Bits().join([pe.get_output() for pe in self._pe_array])
-                self._main_buffer.write_mem2_output(joined)
-            
-            self._main_buffer.execute_instruction(mem_inst)
+            if mem_opcode == MI.WRITE:
+                self._main_buffer.write_mem2_output(self._join_pe_outputs())
+
+            self._main_buffer.execute(mem_opcode, decoded.mem_mode, mema_offset, memb_offset)
 
             # if read, MEM0 and MEM1 to PEs
-            if mem_inst.get_opcode().uint == MI.READ:
-                a_bus = list(self._main_buffer.read_mem0_output().cut(self._controller_config.PE_CONFIG.INPUT_BITWIDTH))
-                b_val = self._main_buffer.read_mem1_output()
-                for i, pe in enumerate(self._pe_array):
-                    pe.input_a(a_bus[i])
-                    pe.input_b(b_val)
-            
-            for pe in self._pe_array:
-                pe.execute_instruction(pe_inst)
-        # END IMPLEMENTATION
+            if mem_opcode == MI.READ:
+                self._load_pe_inputs()
+                if self._sparse:
+                    self._sparse_mask = self._read_mask(mema_offset)
+
+            mema_offset += decoded.mema_inc
+            memb_offset += decoded.memb_inc
+
+            if self._sparse and (decoded.pe_opcode == PEI.NO_VALUE) and (decoded.pe_value == PEI.MAC):
+                self._sparse_mac(decoded.pe_mode)
+            else:
+                self._execute_pe(decoded.pe_opcode, decoded.pe_mode, decoded.pe_value)
+        return 0
+
+    def _read_mask(self, row : int) -> np.ndarray:
+        # PEs Whose Freshly Read Inputs Give a Nonzero Product
+        if self._main_buffer.read_mem1_output().uint == 0:
+            return np.zeros(self._controller_config.PE_COUNT, dtype=bool)
+        return self._main_buffer.mem0_nonzero(row)
+
+    def _sparse_mac(self, mode : int) -> None:
+        stats = self._sparse_stats
+        pe_count = self._controller_config.PE_COUNT
+        stats["mac_cycles"] += 1
+        stats["pe_updates"] += pe_count
+
+        mask = self._sparse_mask
+        if mask is None:
+            self._execute_pe(PEI.NO_VALUE, mode, PEI.MAC)
+            return None
+        active = int(mask.sum())
+        if active == 0:
+            stats["skipped_cycles"] += 1
+            stats["skipped_pe_updates"] += pe_count
+        elif self._vectorized:
+            # The Array Updates Every PE in One Step, so No Update is Skipped
+            self._pe_array.execute(PEI.NO_VALUE, mode, PEI.MAC)
+        else:
+            stats["skipped_pe_updates"] += pe_count - active
+            for pe, update in zip(self._pe_array, mask):
+                if update:
+                    pe.execute(PEI.NO_VALUE, mode, PEI.MAC)
+        return None
+
+    def _sparse_mac_run(self, decoded : DecodedInstruction) -> int:
+        # Gathering and Multiplying Only the Reads with Nonzero Products, then
+        # Loading the Last Read into the PEs Whether it was Skipped or Not
+        steps = decoded.count + 1
+        a_rows, b_words, keep = self._main_buffer.read_run(
+            decoded.mem_mode,
+            decoded.mema_offset, decoded.mema_inc,
+            decoded.memb_offset, decoded.memb_inc,
+            steps, skip_zero=True
+        )
+        if len(a_rows):
+            self._pe_array.mac_run(decoded.pe_mode, a_rows, b_words)
+        self._load_pe_inputs()
+        last = decoded.mema_offset + decoded.count * decoded.mema_inc
+        self._sparse_mask = self._read_mask(last)
+
+        # Kept Reads Update the Whole Array, so Only Skipped Reads Save PE Updates
+        skipped = steps - int(keep.sum())
+        pe_count = self._controller_config.PE_COUNT
+        stats = self._sparse_stats
+        stats["mac_cycles"] += steps
+        stats["skipped_cycles"] += skipped
+        stats["pe_updates"] += steps * pe_count
+        stats["skipped_pe_updates"] += skipped * pe_count
         return 0
+
+    def execute_instruction(self, instruction : Instruction):
+        # START IMPLEMENTATION
+
+        # Addresses are Generated on Plain Int Cursors, so the Instruction
+        # Object is Never Modified and can be Replayed or Shared Across Threads
+        return self.execute_decoded_instruction(self._decoder.decode(instruction))
+        # END IMPLEMENTATION
+
+    @staticmethod
+    def _is_mac_run(decoded : DecodedInstruction) -> bool:
+        return (decoded.mem_opcode == MI.READ) and (decoded.pe_opcode == PEI.NO_VALUE) and (decoded.pe_value == PEI.MAC)
+
+    def _join_pe_outputs(self) -> Bits:
+        if self._vectorized:
+            return self._pe_array.get_output_bus()
+        return Bits().join([pe.get_output() for pe in self._pe_array])
+
+    def _load_pe_inputs(self) -> None:
+        b_val = self._main_buffer.read_mem1_output()
+        if self._vectorized:
+            self._pe_array.input_a_row(self._main_buffer.read_mem0_row())
+            self._pe_array.input_b(b_val)
+            return None
+
+        # Every PE Shares the One MEM0 Bus and Reads its Lane by Offset
+        a_bus = self._main_buffer.read_mem0_output()
+        for i, pe in enumerate(self._pe_array):
+            pe.input_a_lane(a_bus, i)
+            pe.input_b(b_val)
+        return None
+
+    def _execute_pe(self, opcode : int, mode : int, value : int) -> None:
+        if self._vectorized:
+            self._pe_array.execute(opcode, mode, value)
+            return None
+        for pe in self._pe_array:
+            pe.execute(opcode, mode, value)
+        return None
@@ -0,0 +1,299 @@
+from src.processing_element import ProcessingElement, NumpyProcessingElement, ProcessingElementConfiguration
+from src.main_buffer import MainBuffer, MainBufferConfiguration
+from src.accelerator import Accelerator, AcceleratorConfiguration
+from src.matvec import plan_matvec, pack_matrix_loads, pack_vector, matvec_program
+from src.decoded_instruction import DecodedInstruction, InstructionDecoder, decode_instruction
+from src.pipeline import program_cycles
+from src.instruction import MI, PEI, ProcessingElementInstructionConfiguration, MemoryInstructionConfiguration, InstConfig
+from src.assembler import Assembler
+from bitstring import Bits
+import numpy as np
+import argparse
+import json
+import time
+import sys
+
+# Throughput Benchmarks for the Model's Hot Paths. Results are Written as
+# JSON, and Comparing Against a Baseline Fails if any Rate Drops by More
+# than the Threshold.
+
+MODES = [8, 16, 32]
+PE_OPS = {
+    "MAC"  : (PEI.NO_VALUE, PEI.MAC),
+    "PASS" : (PEI.NO_VALUE, PEI.PASS),
+    "OUT"  : (PEI.NO_VALUE, PEI.OUT),
+    "CLR"  : (PEI.NO_VALUE, PEI.CLR),
+    "NOP"  : (PEI.NO_VALUE, PEI.NOP),
+    "RND"  : (PEI.RND, 3),
+}
+
+# Matvec Workloads from the part3 Equivalence Makefile (rows, cols, mode)
+WORKLOADS = {
+    "matvec_int8"  : (1024, 1024, 8),
+    "matvec_int16" : (512, 512, 16),
+    "matvec_int32" : (256, 256, 32),
+}
+
+
+def timed(function, min_time : float) -> tuple:
+    # Calling function Repeatedly for at Least min_time Seconds; Returns
+    # (calls, seconds)
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls, elapsed
+
+def bench_pe(min_time : float) -> dict:
+    config = ProcessingElementConfiguration(INPUT_BITWIDTH=32, ACCUMULATION_BITWIDTH=64, OUTPUT_BITWIDTH=32)
+    results = {}
+    for backend in (ProcessingElement, NumpyProcessingElement):
+        for name, (opcode, value) in PE_OPS.items():
+            for mode in MODES:
+                pe = backend(config)
+                pe.input_a(Bits(hex="0x7f80017e", length=32))
+                pe.input_b(Bits(hex="0x02ff8001", length=32))
+                calls, elapsed = timed(lambda: pe.execute(opcode, mode, value), min_time)
+                results[f"pe.{backend.__name__}.{name}.int{mode}"] = {"instructions_per_sec" : calls / elapsed}
+    return results
+
+class _GetterObject:
+
+    # Exposes Fixed Field Objects Through get_<name>() Calls, the Only Way the
+    # Model Reads an Instruction
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, f"get_{name}", (lambda value: lambda: value)(value))
+
+def bench_assembler() -> Assembler:
+    inst_config = InstConfig(
+        COUNT_BITWIDTH     = 10,
+        MEMA_INC_BITWIDTH  = 1,
+        MEMB_INC_BITWIDTH  = 1,
+        MEMORY_INST_CONFIG = MemoryInstructionConfiguration(OPCODE_BITWIDTH=2, MODE_BITWIDTH=2, MEMA_OFFSET_BITWIDTH=10, MEMB_OFFSET_BITWIDTH=10),
+        PE_INST_CONFIG     = ProcessingElementInstructionConfiguration(OPCODE_BITWIDTH=2, MODE_BITWIDTH=2, VALUE_BITWIDTH=5)
+    )
+    return Assembler(inst_config)
+
+def memory_instruction(assembler : Assembler, opcode : int, mode : int, mema_offset : int, memb_offset : int) -> _GetterObject:
+    # Mode Codes are Shared with PE Instructions, so the Assembler Supplies them
+    return _GetterObject(
+        opcode      = Bits(uint=opcode, length=2),
+        mode        = assembler.convert_pe_instruction(f"NOP INT{mode}").get_mode(),
+        mema_offset = Bits(uint=mema_offset, length=16),
+        memb_offset = Bits(uint=memb_offset, length=16),
+    )
+
+def instruction_objects(assembler : Assembler, program : list) -> list:
+    # Instruction Objects for a Decoded Program, so Benchmarks Go Through
+    # Decode and Dispatch
+    names = {value : name for name, (opcode, value) in PE_OPS.items() if opcode == PEI.NO_VALUE}
+    instructions = []
+    for decoded in program:
+        mode = f"INT{decoded.pe_mode}"
+        text = f"RND {mode} {decoded.pe_value}" if decoded.pe_opcode == PEI.RND else f"{names[decoded.pe_value]} {mode}"
+        instructions.append(_GetterObject(
+            count           = Bits(uint=decoded.count, length=16),
+            mema_inc        = Bits(uint=decoded.mema_inc, length=8),
+            memb_inc        = Bits(uint=decoded.memb_inc, length=8),
+            mem_instruction = memory_instruction(assembler, decoded.mem_opcode, decoded.mem_mode, decoded.mema_offset, decoded.memb_offset),
+            pe_instruction  = assembler.convert_pe_instruction(text),
+        ))
+    return instructions
+
+def bench_buffer(min_time : float) -> dict:
+    # MainBuffer._handle_read Takes an Instruction Object, buffer.read_decoded
+    # Times the Already Decoded Read Underneath it
+    config = MainBufferConfiguration(
+        MEM0_BITWIDTH=2048, MEM0_DEPTH=1024,
+        MEM1_BITWIDTH=32,   MEM1_DEPTH=1024,
+        MEM2_BITWIDTH=2048, MEM2_DEPTH=1024
+    )
+    buffer = MainBuffer(config)
+    rng = np.random.default_rng(0)
+    buffer.set_mem0_array(rng.integers(0, 256, (1024, 256), dtype=np.uint8))
+    buffer.set_mem1_array(rng.integers(0, 256, (1024, 4), dtype=np.uint8))
+    assembler = bench_assembler()
+    results = {}
+    for mode in MODES:
+        instruction = memory_instruction(assembler, MI.READ, mode, 17, 513)
+        calls, elapsed = timed(lambda: buffer._handle_read(instruction), min_time)
+        results[f"buffer.handle_read.int{mode}"] = {"instructions_per_sec" : calls / elapsed}
+        calls, elapsed = timed(lambda: buffer._read(mode, 17, 513), min_time)
+        results[f"buffer.read_decoded.int{mode}"] = {"instructions_per_sec" : calls / elapsed}
+    return results
+
+def bench_decode(min_time : float) -> dict:
+    # Replaying One Program Through Plain Field Extraction and Through the
+    # Memoizing Decoder, Which Only Pays for Extraction on the First Pass
+    rng = np.random.default_rng(0)
+    steps = [(PEI.NO_VALUE, PEI.MAC), (PEI.NO_VALUE, PEI.OUT), (PEI.RND, 3), (PEI.NO_VALUE, PEI.CLR)]
+    program = [
+        DecodedInstruction(k % 3, mode, int(rng.integers(1024)), int(rng.integers(1024)), opcode, mode, value, int(rng.integers(1024)), 1, 1)
+        for k, (mode, (opcode, value)) in enumerate(zip(MODES * 22, steps * 16))
+    ]
+    program = instruction_objects(bench_assembler(), program)
+
+    results = {}
+    for name, decode in [("plain", decode_instruction), ("memoized", InstructionDecoder().decode)]:
+        calls, elapsed = timed(lambda: [decode(inst) for inst in program], min_time)
+        results[f"decode.{name}"] = {"instructions_per_sec" : len(program) * calls / elapsed}
+    return results
+
+def workload_config(pe_count : int = 64) -> AcceleratorConfiguration:
+    pe_config = ProcessingElementConfiguration(INPUT_BITWIDTH=32, ACCUMULATION_BITWIDTH=64, OUTPUT_BITWIDTH=32)
+    return AcceleratorConfiguration(
+        COUNTER_BITWIDTH = 10,
+        PE_COUNT         = pe_count,
+        PE_CONFIG        = pe_config,
+        BUFFER_CONFIG    = MainBufferConfiguration(
+            MEM0_BITWIDTH = pe_count * 32, MEM0_DEPTH = 1024,
+            MEM1_BITWIDTH = 32,            MEM1_DEPTH = 1024,
+            MEM2_BITWIDTH = pe_count * 32, MEM2_DEPTH = 1024
+        )
+    )
+
+def matvec_instruction_stats(config : AcceleratorConfiguration, rows : int, cols : int, mode : int) -> tuple:
+    # (instructions, simulated cycles) for One Vector Through run_matvec,
+    # Counting Dispatch and PE Drain Cycles as the Pipeline Model Does
+    plan = plan_matvec(config, rows, cols, mode)
+    instructions = cycles = 0
+    for kc in range(plan.k_chunks):
+        for t0 in range(0, plan.row_tiles, plan.tiles_per_load):
+            program = matvec_program(plan, min(plan.tiles_per_load, plan.row_tiles - t0))
+            instructions += len(program)
+            cycles += program_cycles(program)
+    return instructions, cycles
+
+def bench_accelerator(min_time : float, vectorized : bool) -> dict:
+    # execute_instructions Runs the First MEM0 Load of Each Workload from
+    # Instruction Objects; run_matvec Runs the Whole Workload from Decoded
+    # Programs, Including Packing
+    config = workload_config()
+    assembler = bench_assembler()
+    rng = np.random.default_rng(0)
+    backend = "vectorized" if vectorized else "per_pe"
+    results = {}
+    for name, (rows, cols, mode) in WORKLOADS.items():
+        matrix = rng.integers(-5, 6, (rows, cols))
+        vector = rng.integers(-5, 6, cols)
+
+        plan = plan_matvec(config, rows, cols, mode)
+        t0, tiles, kc, mem0_image = pack_matrix_loads(config, plan, matrix)[0]
+        program = matvec_program(plan, tiles)
+        instructions = instruction_objects(assembler, program)
+        accelerator = Accelerator(config, vectorized=vectorized)
+        accelerator.set_mem0_array(mem0_image)
+        accelerator.set_mem1_array(pack_vector(config, plan, vector, kc))
+        calls, elapsed = timed(lambda: accelerator.execute_instructions(instructions), min_time)
+        results[f"accelerator.{backend}.{name}.execute_instructions"] = {
+            "instructions_per_sec" : len(program) * calls / elapsed,
+            "cycles_per_sec"       : program_cycles(program) * calls / elapsed,
+        }
+
+        accelerator = Accelerator(config, vectorized=vectorized)
+        calls, elapsed = timed(lambda: accelerator.run_matvec(matrix, vector, mode), min_time)
+        instruction_count, cycles = matvec_instruction_stats(config, rows, cols, mode)
+        results[f"accelerator.{backend}.{name}.run_matvec"] = {
+            "instructions_per_sec" : instruction_count * calls / elapsed,
+            "cycles_per_sec"       : cycles * calls / elapsed,
+        }
+    return results
+
+def kernel_program(rng : np.random.Generator, depth : int, length : int) -> list[DecodedInstruction]:
+    # Convolution-Shaped Steps: Three Short READ+MAC Windows at Row Strides,
+    # then Rounding, Output and a Write. The Mode Changes Every 16 Outputs,
+    # as Between Layers.
+    program = []
+    for step in range(length):
+        mode = MODES[(step // 16) % len(MODES)]
+        base, weights = int(rng.integers(0, depth - 70)), int(rng.integers(0, depth - 10))
+        program += [
+            DecodedInstruction(MI.READ, mode, base + 32 * row, weights + 3 * row, PEI.NO_VALUE, mode, PEI.MAC, 2, 1, 1)
+            for row in range(3)
+        ]
+        program += [
+            DecodedInstruction(MI.NOP,   mode, 0, 0, PEI.RND, mode, 2),
+            DecodedInstruction(MI.NOP,   mode, 0, 0, PEI.NO_VALUE, mode, PEI.OUT),
+            DecodedInstruction(MI.WRITE, mode, step % depth, 0, PEI.NO_VALUE, mode, PEI.CLR),
+        ]
+    return program
+
+def bench_kernel(min_time : float, vectorized : bool) -> dict:
+    # The Same Program Interpreted and as a Compiled Kernel, from the Same
+    # Starting State Each Call
+    config = workload_config(pe_count=16)
+    rng = np.random.default_rng(0)
+    program = kernel_program(rng, 1024, 64)
+    mem0 = rng.integers(0, 256, (1024, 16 * 4), dtype=np.uint8)
+    mem1 = rng.integers(0, 256, (1024, 4), dtype=np.uint8)
+    backend = "vectorized" if vectorized else "per_pe"
+    accelerator = Accelerator(config, vectorized=vectorized)
+    accelerator.set_mem0_array(mem0)
+    accelerator.set_mem1_array(mem1)
+    kernel = accelerator.compile_kernel(program)
+
+    rates = {}
+    for name, run in [("interpreted", lambda: [accelerator.execute_decoded_instruction(decoded) for decoded in program]), ("compiled", lambda: kernel(accelerator))]:
+        calls, elapsed = timed(run, min_time)
+        rates[name] = len(program) * calls / elapsed
+    return {
+        f"kernel.{backend}.interpreted" : {"instructions_per_sec" : rates["interpreted"]},
+        f"kernel.{backend}.compiled"    : {"instructions_per_sec" : rates["compiled"], "speedup_x100" : 100 * rates["compiled"] / rates["interpreted"]},
+    }
+
+def compare(results : dict, baseline : dict, threshold : float) -> list[str]:
+    # Every Rate Must Stay Within threshold (a Fraction) of the Baseline
+    regressions = []
+    for name, metrics in baseline.items():
+        for metric, base_value in metrics.items():
+            value = results.get(name, {}).get(metric)
+            if value is not None and value < base_value * (1 - threshold):
+                regressions.append(f"{name}.{metric}: {value:.1f} < {base_value:.1f} (-{100 * (1 - value / base_value):.1f}%)")
+    return regressions
+
+
+def main():
+
+    # Parsing Arguments
+    parser = argparse.ArgumentParser(description="Model throughput benchmarks.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement")
+    parser.add_argument("--per-pe", action="store_true", help="also run the matvec workloads on the per-PE backend (slow)")
+    parser.add_argument("--out", default=None, help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed fractional slowdown")
+    args = parser.parse_args()
+
+    # Running the Benchmarks
+    results = {}
+    results.update(bench_pe(args.min_time))
+    results.update(bench_decode(args.min_time))
+    results.update(bench_buffer(args.min_time))
+    results.update(bench_accelerator(args.min_time, vectorized=True))
+    results.update(bench_kernel(args.min_time, vectorized=True))
+    if args.per_pe:
+        results.update(bench_accelerator(args.min_time, vectorized=False))
+        results.update(bench_kernel(args.min_time, vectorized=False))
+
+    for name, metrics in results.items():
+        print(f"{name:60s} " + "  ".join(f"{metric}={value:,.0f}" for metric, value in metrics.items()))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    # Checking for Regressions
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    sys.exit(len(regressions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+from .instruction import MI, PEI
+from .decoded_instruction import DecodedInstruction, InstructionLayout
+import numpy as np
+import hashlib
+import os
+
+# Whole-Program Assembler. Each Line Holds One Instruction as Up to Three
+# ';' Separated Parts, Memory Then PE Then Loop Control:
+#
+#     READ INT8 0 0 ; MAC INT8 ; 1023 1 1
+#     NOP INT8 ; OUT INT8
+#     WRITE INT8 3 ; NOP INT8
+#     NOP INT16 ; RND INT16 2
+#
+# Memory Offsets, the PE Value and the Loop Part (count mema_inc memb_inc)
+# Default to Zero, and '#' Starts a Comment. Parsing is Table Driven and Each
+# Distinct Line is Parsed Once. Assembled Programs are Cached by the Hash of
+# their Text and the Instruction Layout, in Memory and Optionally on Disk.
+
+MODES = {"INT8" : 8, "INT16" : 16, "INT32" : 32}
+MEM_OPS = {"READ" : MI.READ, "WRITE" : MI.WRITE, "NOP" : MI.NOP}
+PE_OPS = {name : (PEI.NO_VALUE, getattr(PEI, name)) for name in ["MAC", "NOP", "OUT", "PASS", "CLR"]}
+PE_OPS["RND"] = (PEI.RND, None)
+
+_MODE_NAMES = {bitwidth : name for name, bitwidth in MODES.items()}
+_MEM_OP_NAMES = {opcode : name for name, opcode in MEM_OPS.items()}
+_PE_OP_NAMES = {key : name for name, key in PE_OPS.items() if name != "RND"}
+
+
+def _token(table : dict, token : str, kind : str, line : str):
+    value = table.get(token.upper())
+    if value is None:
+        raise ValueError(f"Unknown {kind} [{token}] in line [{line}].")
+    return value
+
+def _numbers(tokens : list[str], count : int, kind : str, line : str) -> list[int]:
+    if len(tokens) > count:
+        raise ValueError(f"Too many {kind} fields in line [{line}].")
+    try:
+        values = [int(token, 0) for token in tokens]
+    except ValueError:
+        raise ValueError(f"Non-integer {kind} field in line [{line}].")
+    return values + [0] * (count - len(values))
+
+def parse_line(line : str) -> DecodedInstruction:
+    parts = [part.split() for part in line.split(";")]
+    if not (2 <= len(parts) <= 3) or not parts[0] or not parts[1]:
+        raise ValueError(f"Expected 'memory ; pe [; loop]' in line [{line}].")
+    mem, pe = parts[0], parts[1]
+    loop = parts[2] if len(parts) == 3 else []
+
+    mem_opcode = _token(MEM_OPS, mem[0], "memory opcode", line)
+    mem_mode = _token(MODES, mem[1], "mode", line) if len(mem) > 1 else 8
+    mema_offset, memb_offset = _numbers(mem[2:], 2, "memory offset", line)
+
+    pe_opcode, pe_value = _token(PE_OPS, pe[0], "PE opcode", line)
+    pe_mode = _token(MODES, pe[1], "mode", line) if len(pe) > 1 else mem_mode
+    shift, = _numbers(pe[2:], 1, "PE value", line)
+    if pe_value is None:
+        pe_value = shift
+    elif shift:
+        raise ValueError(f"Only RND takes a value, in line [{line}].")
+
+    count, mema_inc, memb_inc = _numbers(loop, 3, "loop", line)
+    return DecodedInstruction(mem_opcode, mem_mode, mema_offset, memb_offset, pe_opcode, pe_mode, pe_value, count, mema_inc, memb_inc)
+
+def format_line(decoded : DecodedInstruction) -> str:
+    # Inverse of parse_line
+    mem = f"{_MEM_OP_NAMES[decoded.mem_opcode]} {_MODE_NAMES[decoded.mem_mode]} {decoded.mema_offset} {decoded.memb_offset}"
+    if decoded.pe_opcode == PEI.NO_VALUE:
+        pe = f"{_PE_OP_NAMES[(PEI.NO_VALUE, decoded.pe_value)]} {_MODE_NAMES[decoded.pe_mode]}"
+    else:
+        pe = f"RND {_MODE_NAMES[decoded.pe_mode]} {decoded.pe_value}"
+    return f"{mem} ; {pe} ; {decoded.count} {decoded.mema_inc} {decoded.memb_inc}"
+
+
+class BulkAssembler:
+
+    def __init__(self, inst_config, cache_dir : str = None):
+        self._layout = InstructionLayout(inst_config)
+        self._layout_key = repr(inst_config).encode()
+        self._cache_dir = cache_dir
+        self._programs = {}
+        self._lines = {}
+        if self._cache_dir:
+            os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def layout(self) -> InstructionLayout:
+        return self._layout
+
+    def assemble_file(self, path : str) -> np.ndarray:
+        with open(path, "rb") as f:
+            return self.assemble_text(f.read())
+
+    def assemble_text(self, text) -> np.ndarray:
+        # Packed Words (uint64, or Python Ints for Layouts Wider than 64 Bits).
+        # The Array is Shared by Every Caller Assembling the Same Text, so it is
+        # Read-Only; Copy it Before Editing
+        if isinstance(text, str):
+            text = text.encode()
+        key = hashlib.sha256(self._layout_key + b"\0" + text).hexdigest()
+        words = self._programs.get(key)
+        if words is not None:
+            return words
+
+        path = os.path.join(self._cache_dir, f"{key}.npy") if self._cache_dir else None
+        if path and os.path.exists(path):
+            words = np.load(path, allow_pickle=(self._layout.width > 64))
+        else:
+            words = self._assemble(text.decode())
+            if path:
+                temp = f"{path}.{os.getpid()}.tmp.npy"
+                np.save(temp, words)
+                os.replace(temp, path)
+        words.flags.writeable = False
+        self._programs[key] = words
+        return words
+
+    def _assemble(self, text : str) -> np.ndarray:
+        lines = self._lines
+        words = []
+        for number, raw in enumerate(text.splitlines(), 1):
+            line = raw.split("#", 1)[0].strip()
+            if not line:
+                continue
+            word = lines.get(line)
+            if word is None:
+                try:
+                    word = self._layout.encode(parse_line(line))
+                except ValueError as error:
+                    raise ValueError(f"Line {number}: {error}")
+                lines[line] = word
+            words.append(word)
+        dtype = np.uint64 if self._layout.width <= 64 else object
+        return np.array(words, dtype=dtype)
+
+    def decode(self, words : np.ndarray) -> list[DecodedInstruction]:
+        return [self._layout.decode(int(word)) for word in words]
+
+    def write_asm(self, path : str, program : list[DecodedInstruction]) -> None:
+        with open(path, "w") as f:
+            f.write("".join(format_line(decoded) + "\n" for decoded in program))
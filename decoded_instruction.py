@@ -0,0 +1,259 @@
+from bitstring import BitArray
+from .instruction import Instruction, Mode
+from .assembler import Assembler
+
+
+class DecodedInstruction:
+
+    # Plain-Int View of an Instruction. Modes are Stored as Bitwidths (8/16/32)
+    # and count is the Raw Field, so the Instruction Runs count + 1 Times.
+
+    __slots__ = (
+        "mem_opcode", "mem_mode", "mema_offset", "memb_offset",
+        "pe_opcode", "pe_mode", "pe_value",
+        "count", "mema_inc", "memb_inc",
+    )
+
+    def __init__(
+        self,
+        mem_opcode  : int,
+        mem_mode    : int,
+        mema_offset : int,
+        memb_offset : int,
+        pe_opcode   : int,
+        pe_mode     : int,
+        pe_value    : int,
+        count       : int = 0,
+        mema_inc    : int = 0,
+        memb_inc    : int = 0
+    ):
+        self.mem_opcode  = mem_opcode
+        self.mem_mode    = mem_mode
+        self.mema_offset = mema_offset
+        self.memb_offset = memb_offset
+        self.pe_opcode   = pe_opcode
+        self.pe_mode     = pe_mode
+        self.pe_value    = pe_value
+        self.count       = count
+        self.mema_inc    = mema_inc
+        self.memb_inc    = memb_inc
+
+    def astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DecodedInstruction) and (self.astuple() == other.astuple())
+
+    def __hash__(self) -> int:
+        return hash(self.astuple())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"DecodedInstruction({fields})"
+
+
+def instruction_fields(instruction : Instruction) -> tuple:
+    # The Field Objects of an Instruction, Without Reading their Values
+    mem_inst = instruction.get_mem_instruction()
+    pe_inst = instruction.get_pe_instruction()
+    return (
+        instruction.get_count(),
+        instruction.get_mema_inc(),
+        instruction.get_memb_inc(),
+        mem_inst.get_opcode(),
+        mem_inst.get_mode(),
+        mem_inst.get_mema_offset(),
+        mem_inst.get_memb_offset(),
+        pe_inst.get_opcode(),
+        pe_inst.get_mode(),
+        pe_inst.get_value(),
+    )
+
+def decode_instruction(instruction : Instruction) -> DecodedInstruction:
+    mem_inst = instruction.get_mem_instruction()
+    pe_inst = instruction.get_pe_instruction()
+    return DecodedInstruction(
+        mem_opcode  = mem_inst.get_opcode().uint,
+        mem_mode    = Mode.bitwidth(int(mem_inst.get_mode().uint)),
+        mema_offset = mem_inst.get_mema_offset().uint,
+        memb_offset = mem_inst.get_memb_offset().uint,
+        pe_opcode   = pe_inst.get_opcode().uint,
+        pe_mode     = pe_inst.get_mode_bitwidth(),
+        pe_value    = pe_inst.get_value().uint,
+        count       = instruction.get_count().uint,
+        mema_inc    = instruction.get_mema_inc().uint,
+        memb_inc    = instruction.get_memb_inc().uint,
+    )
+
+
+class InstructionDecoder:
+
+    # Decodes Instructions Once and Memoizes the Records by the Identity of
+    # their Field Objects. Bits are Immutable, so Setters Replace a Field and
+    # a Changed Instruction Misses; Hashing Ids Costs a Fraction of Reading
+    # the Field Values. Mutable BitArray Fields are Decoded Every Time.
+
+    def __init__(self, max_entries : int = 1 << 16):
+        self._max_entries = max_entries
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def decode(self, instruction : Instruction) -> DecodedInstruction:
+        fields = instruction_fields(instruction)
+        key = tuple(map(id, fields))
+        entry = self._cache.get(key)
+        if entry is not None:
+            return entry[1]
+
+        # Entries Hold the Field Objects, so their Ids are Never Reused While Cached
+        decoded = decode_instruction(instruction)
+        if not any(isinstance(field, BitArray) for field in fields):
+            if len(self._cache) >= self._max_entries:
+                self._cache.clear()
+            self._cache[key] = (fields, decoded)
+        return decoded
+
+    def decode_program(self, instructions : list[Instruction]) -> list[DecodedInstruction]:
+        return [self.decode(inst) for inst in instructions]
+
+
+class InstructionLayout:
+
+    # Bit Layout of a Packed Instruction Word for an Instruction Configuration.
+    # Fields are Packed MSB First in the Order instruction_fields Reads them
+    # From an Upstream Instruction: count, mema_inc, memb_inc, then the Memory
+    # Instruction (opcode, mode, mema_offset, memb_offset), then the PE
+    # Instruction (opcode, mode, value). Field Widths and Mode Codes Come from
+    # the Upstream Configuration and Assembler, but the Field Order is an
+    # Assumption: the Encoder Behind inst.bits is Not in this Tree, so Check a
+    # Foreign inst.bits Against its Instruction Objects with pack() First.
+
+    def __init__(self, inst_config, max_entries : int = 1 << 16):
+        mem_config = inst_config.MEMORY_INST_CONFIG
+        pe_config = inst_config.PE_INST_CONFIG
+        widths = [
+            ("count",       inst_config.COUNT_BITWIDTH),
+            ("mema_inc",    inst_config.MEMA_INC_BITWIDTH),
+            ("memb_inc",    inst_config.MEMB_INC_BITWIDTH),
+            ("mem_opcode",  mem_config.OPCODE_BITWIDTH),
+            ("mem_mode",    mem_config.MODE_BITWIDTH),
+            ("mema_offset", mem_config.MEMA_OFFSET_BITWIDTH),
+            ("memb_offset", mem_config.MEMB_OFFSET_BITWIDTH),
+            ("pe_opcode",   pe_config.OPCODE_BITWIDTH),
+            ("pe_mode",     pe_config.MODE_BITWIDTH),
+            ("pe_value",    pe_config.VALUE_BITWIDTH),
+        ]
+
+        # Shift and Mask of Each Field
+        self.width = sum(width for _, width in widths)
+        self._fields = []
+        shift = self.width
+        for name, width in widths:
+            shift -= width
+            self._fields.append((name, shift, (1 << width) - 1))
+
+        # Mode Codes <-> Bitwidths, as the Upstream Assembler Encodes them.
+        # Memory Instructions Share the PE Mode Codes (Both Decode Through Mode)
+        self._mem_modes = _mode_table(inst_config, mem_config.MODE_BITWIDTH)
+        self._pe_modes = _mode_table(inst_config, pe_config.MODE_BITWIDTH)
+        self._mem_codes = {bitwidth : code for code, bitwidth in self._mem_modes.items()}
+        self._pe_codes = {bitwidth : code for code, bitwidth in self._pe_modes.items()}
+
+        # Decoded Records, Memoized by Word (Bounded so Streams Stay Flat)
+        self._max_entries = max_entries
+        self._cache = {}
+
+    def field_max(self, name : str) -> int:
+        # Largest Value the Named Field Holds
+        for field, _, mask in self._fields:
+            if field == name:
+                return mask
+        raise ValueError(f"Unknown instruction field [{name}].")
+
+    def decode(self, word : int) -> DecodedInstruction:
+        decoded = self._cache.get(word)
+        if decoded is None:
+            fields = {name : (word >> shift) & mask for name, shift, mask in self._fields}
+            fields["mem_mode"] = self._mem_modes[fields["mem_mode"]]
+            fields["pe_mode"] = self._pe_modes[fields["pe_mode"]]
+            decoded = DecodedInstruction(**fields)
+            if len(self._cache) >= self._max_entries:
+                self._cache.clear()
+            self._cache[word] = decoded
+        return decoded
+
+    def encode(self, decoded : DecodedInstruction) -> int:
+        word = 0
+        for name, shift, mask in self._fields:
+            value = getattr(decoded, name)
+            if name == "mem_mode":
+                value = self._mem_codes[value]
+            elif name == "pe_mode":
+                value = self._pe_codes[value]
+            if value > mask:
+                raise ValueError(f"Field {name} value [{value}] does not fit in {mask.bit_length()} bits.")
+            word |= value << shift
+        return word
+
+    def pack(self, instruction : Instruction) -> int:
+        # Packs the Raw Field Bits of an Upstream Instruction, Without Decoding
+        word = 0
+        for (name, shift, mask), field in zip(self._fields, instruction_fields(instruction)):
+            value = field.uint
+            if value > mask:
+                raise ValueError(f"Field {name} value [{value}] does not fit in {mask.bit_length()} bits.")
+            word |= value << shift
+        return word
+
+def _mode_table(inst_config, mode_bitwidth : int) -> dict:
+    assembler = Assembler(inst_config)
+    table = {}
+    for bitwidth in [8, 16, 32]:
+        code = assembler.convert_pe_instruction(f"NOP INT{bitwidth}").get_mode().uint
+        if code >> mode_bitwidth:
+            raise ValueError(f"Mode code [{code}] for INT{bitwidth} does not fit in {mode_bitwidth} bits.")
+        if Mode.bitwidth(code) != bitwidth:
+            raise ValueError(f"Assembler mode code [{code}] decodes to INT{Mode.bitwidth(code)}, not INT{bitwidth}.")
+        table[code] = bitwidth
+    return table
+
+
+def stream_program(path : str, layout : InstructionLayout, binary : bool = None, chunk_words : int = 4096):
+    # Yields Decoded Instructions from an inst.bits File Without Loading it.
+    # Text Files Hold One Word of Binary Digits per Line; Binary Files Hold
+    # Big-Endian Words of ceil(width / 8) Bytes. By Default the Format is
+    # Guessed from the First Line.
+    word_bytes = (layout.width + 7) // 8
+    with open(path, "rb") as f:
+        if binary is None:
+            head = f.readline().strip()
+            binary = not (len(head) == layout.width and set(head) <= set(b"01"))
+            f.seek(0)
+
+        if binary:
+            while True:
+                chunk = f.read(word_bytes * chunk_words)
+                if not chunk:
+                    break
+                for i in range(0, len(chunk) - word_bytes + 1, word_bytes):
+                    yield layout.decode(int.from_bytes(chunk[i : i + word_bytes], "big"))
+        else:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield layout.decode(int(line, 2))
+
+def write_program(path : str, program : list[DecodedInstruction], layout : InstructionLayout, binary : bool = False) -> None:
+    # Writing a Program in Either Format stream_program Reads
+    words = [layout.encode(decoded) for decoded in program]
+    with open(path, "wb") as f:
+        if binary:
+            word_bytes = (layout.width + 7) // 8
+            f.write(b"".join(word.to_bytes(word_bytes, "big") for word in words))
+        else:
+            f.write("".join(f"{word:0{layout.width}b}\n" for word in words).encode())
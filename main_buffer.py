@@ -2,6 +2,7 @@ from bitstring import Bits
 from .instruction import MemoryInstruction, MI, Mode
 from dataclasses import dataclass
 import numpy as np
+import os
 
 @dataclass
 class MainBufferConfiguration:
@@ -12,6 +13,113 @@ class MainBufferConfiguration:
     MEM2_BITWIDTH : int
     MEM2_DEPTH    : int
 
+# Packed Word Helpers. Each Memory is a (DEPTH x bytes) uint8 Array Holding
+# Big-Endian Words, Right Aligned when the Bitwidth is not a Multiple of 8.
+def _word_bytes(width : int) -> int:
+    return (width + 7) // 8
+
+def _pack_words(values : list[int], width : int) -> np.ndarray:
+    # Packing Unsigned Word Values into a Contiguous Byte Array
+    nbytes = _word_bytes(width)
+    data = b"".join(value.to_bytes(nbytes, "big") for value in values)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(values), nbytes).copy()
+
+def _signed_to_unsigned(values : list[int], width : int) -> list[int]:
+    # Two's Complement Encoding with the Same Range Check as Bits(int=...)
+    low, high = -(1 << (width - 1)), (1 << (width - 1))
+    mask = (1 << width) - 1
+    for value in values:
+        if not (low <= value < high):
+            raise ValueError(f"Value [{value}] does not fit in a signed {width} bit word.")
+    return [value & mask for value in values]
+
+def _row_to_uint(row : np.ndarray) -> int:
+    return int.from_bytes(row.tobytes(), "big")
+
+def _row_to_bits(row : np.ndarray, width : int) -> Bits:
+    return Bits(bytes=row.tobytes(), offset=(row.shape[-1] * 8 - width), length=width)
+
+def _uint_to_row(value : int, width : int) -> np.ndarray:
+    return np.frombuffer(value.to_bytes(_word_bytes(width), "big"), dtype=np.uint8)
+
+def _rows_to_uint64(rows : np.ndarray) -> np.ndarray:
+    # Words of at Most 64 Bits as One uint64 per Row
+    padded = np.zeros((rows.shape[0], 8), dtype=np.uint8)
+    padded[:, 8 - rows.shape[1]:] = rows
+    return padded.view(">u8")[:, 0].astype(np.uint64)
+
+class BitsFileImage:
+
+    # Read-Only Memory Image Backed by a Memory-Mapped Text .bits File (One
+    # Word of Binary Digits per Line, MSB First). Words are Decoded Lazily, so
+    # Rows Index like the Packed (DEPTH x bytes) Arrays MainBuffer Stores.
+
+    def __init__(self, path : str, width : int, depth : int):
+
+        # Saving Inputs
+        self._path  = path
+        self._width = width
+        self._depth = depth
+        self._pad   = _word_bytes(width) * 8 - width
+
+        # Mapping the File (Empty Files Cannot be Mapped) and Finding the Fixed Line Stride
+        if os.path.getsize(path) == 0:
+            raise ValueError(f"Length of Memory [0] in {path} is incorrect for depth [{depth}] ")
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        newline = np.flatnonzero(raw[:width + 3] == ord("\n"))
+        stride = int(newline[0]) + 1 if len(newline) else len(raw) + 1
+        line_width = stride - 1 - (1 if (stride > 1 and raw[stride - 2] == ord("\r")) else 0)
+        if line_width != width:
+            raise ValueError(f"Word width [{line_width}] in {path} is incorrect for bitwidth [{width}] ")
+
+        # Number of Complete Words (the Last Line May Lack a Newline)
+        lines = (len(raw) + stride - width) // stride
+        if lines != depth:
+            raise ValueError(f"Length of Memory [{lines}] in {path} is incorrect for depth [{depth}] ")
+
+        # (DEPTH x width) View of the Digit Characters, Without Copying
+        self._chars = np.lib.stride_tricks.as_strided(raw, shape=(depth, width), strides=(stride, 1), writeable=False)
+
+    def __len__(self) -> int:
+        return self._depth
+
+    @property
+    def shape(self) -> tuple:
+        return (self._depth, _word_bytes(self._width))
+
+    def __getitem__(self, index):
+        # Decoding Only the Requested Rows
+        index = np.asarray(index)
+        bits = np.zeros(index.shape + (self._pad + self._width,), dtype=bool)
+        bits[..., self._pad:] = self._chars[index] == ord("1")
+        return np.packbits(bits, axis=-1)
+
+    def __array__(self, dtype=None, copy=None):
+        rows = self[np.arange(self._depth)]
+        return rows if dtype is None else rows.astype(dtype)
+
+
+def write_bits_file(path : str, image : np.ndarray, width : int) -> None:
+    # Writing a Packed (DEPTH x bytes) Image as a Text .bits File, the Format
+    # BitsFileImage Maps, Without a Per-Word Python Loop
+    rows = np.unpackbits(np.asarray(image, dtype=np.uint8), axis=1)[:, -width:]
+    text = np.empty((rows.shape[0], width + 1), dtype=np.uint8)
+    text[:, :width] = rows + ord("0")
+    text[:, width] = ord("\n")
+    with open(path, "wb") as f:
+        f.write(text.tobytes())
+
+def _load_memory_image(path : str, width : int, depth : int):
+    # .npy Files Hold a Packed (DEPTH x bytes) uint8 Image and are Mapped
+    # Directly; Anything Else is Treated as a Text .bits File
+    if str(path).endswith(".npy"):
+        image = np.load(path, mmap_mode="r")
+        if (image.dtype != np.uint8) or (image.shape != (depth, _word_bytes(width))):
+            raise ValueError(f"Memory image {path} of shape {image.shape} and dtype {image.dtype} is incorrect for depth [{depth}] and bitwidth [{width}] ")
+        return image
+    return BitsFileImage(path, width, depth)
+
+
 class MainBuffer:
 
     def __init__(
@@ -23,15 +131,118 @@ class MainBuffer:
         # Saving the Config
         self._buffer_config = config
 
-        # Creating the Individual Memories
-        self._mem0 = [Bits(int=default_value, length=self._buffer_config.MEM0_BITWIDTH) for _ in range(self._buffer_config.MEM0_DEPTH)]
-        self._mem1 = [Bits(int=default_value, length=self._buffer_config.MEM1_BITWIDTH) for _ in range(self._buffer_config.MEM1_DEPTH)]
-        self._mem2 = [Bits(int=default_value, length=self._buffer_config.MEM2_BITWIDTH) for _ in range(self._buffer_config.MEM2_DEPTH)]
+        # Optional MEM1 Broadcast Tables (Disabled Until Enabled)
+        self._broadcast_limit  = None
+        self._broadcast_tables = {}
+        self._broadcast_stale  = False
+
+        # Optional Index of Nonzero MEM0 Slices (Disabled Until Enabled), Filled
+        # in Row by Row as Rows are Read
+        self._sparse_slice_bits = None
+        self._mem0_nonzero      = None
+        self._mem0_indexed      = None
+
+        # Creating the Individual Memories as Packed Word Arrays
+        self._mem0 = self._filled_memory(default_value, self._buffer_config.MEM0_BITWIDTH, self._buffer_config.MEM0_DEPTH)
+        self._mem1 = self._filled_memory(default_value, self._buffer_config.MEM1_BITWIDTH, self._buffer_config.MEM1_DEPTH)
+        self._mem2 = self._filled_memory(default_value, self._buffer_config.MEM2_BITWIDTH, self._buffer_config.MEM2_DEPTH)
+
+        # Creating the Output And Input Ports. MEM0 Holds the Row Read Last, MEM1
+        # the Unsigned (Broadcast) Word, MEM2 the Packed Row to Write, and Bits
+        # are Only Built when Asked For
+        self._mem0_output_port = _uint_to_row(_signed_to_unsigned([default_value], self._buffer_config.MEM0_BITWIDTH)[0], self._buffer_config.MEM0_BITWIDTH)
+        self._mem1_output_port = _signed_to_unsigned([default_value], self._buffer_config.MEM1_BITWIDTH)[0]
+        self._mem2_input_port  = _uint_to_row(_signed_to_unsigned([default_value], self._buffer_config.MEM2_BITWIDTH)[0], self._buffer_config.MEM2_BITWIDTH)
+
+        # MEM2 Addresses Written Since the Last Delta Readback
+        self._mem2_dirty = set()
+
+    @staticmethod
+    def _filled_memory(value : int, width : int, depth : int) -> np.ndarray:
+        row = _uint_to_row(_signed_to_unsigned([value], width)[0], width)
+        return np.tile(row, (depth, 1))
+
+    def enable_broadcast_tables(self, max_bytes : int = 64 << 20) -> int:
+        # Precomputing the Broadcast MEM1 Word for Every (Address, Sub-Word),
+        # so Sub-Word Reads are One Lookup. Tables are Rebuilt on the First
+        # Read After MEM1 Changes, so Loading a Mapped Image Stays Lazy, and
+        # are Skipped if they Would Exceed max_bytes. Returns the Bytes Used.
+        self._broadcast_limit = max_bytes
+        self._build_broadcast_tables()
+        return self.broadcast_table_bytes()
+
+    def disable_broadcast_tables(self) -> None:
+        self._broadcast_limit  = None
+        self._broadcast_tables = {}
+        self._broadcast_stale  = False
+
+    def broadcast_table_bytes(self) -> int:
+        if self._broadcast_stale:
+            self._build_broadcast_tables()
+        return sum(table.nbytes for table in self._broadcast_tables.values())
+
+    def _set_mem1_image(self, image) -> None:
+        self._mem1 = image
+        if self._broadcast_limit is not None:
+            self._broadcast_tables = {}
+            self._broadcast_stale  = True
+
+    def _build_broadcast_tables(self) -> None:
+        self._broadcast_tables = {}
+        self._broadcast_stale  = False
+        width = self._buffer_config.MEM1_BITWIDTH
+        modes = [mode for mode in (8, 16, 32) if (mode < width) and (width % mode == 0)]
+        if (width > 64) or (8 * self._buffer_config.MEM1_DEPTH * sum(width // mode for mode in modes) > self._broadcast_limit):
+            return
+
+        # Row base * lanes + sel of a Table is the Broadcast of Sub-Word sel
+        words = _rows_to_uint64(np.asarray(self._mem1))
+        for mode in modes:
+            lanes = width // mode
+            shifts = np.arange(lanes, dtype=np.uint64) * np.uint64(mode)
+            pieces = (words[:, None] >> shifts) & np.uint64((1 << mode) - 1)
+            replicate = sum(1 << (k * mode) for k in range(lanes))
+            self._broadcast_tables[mode] = (pieces * np.uint64(replicate)).reshape(-1)
+
+    def enable_sparse_index(self, slice_bits : int) -> None:
+        # Indexing Which slice_bits Wide Slices of MEM0 Words are Nonzero, so
+        # Zero Reads can be Skipped Downstream. Rows are Indexed the First Time
+        # they are Asked For, so Mapped Images are Never Decoded Up Front.
+        width = self._buffer_config.MEM0_BITWIDTH
+        if (slice_bits % 8) or (width % slice_bits):
+            raise ValueError(f"Sparse index needs byte-aligned slices dividing MEM0 bitwidth {width}, got {slice_bits}.")
+        self._sparse_slice_bits = slice_bits
+        self._reset_sparse_index()
 
-        # Creating the Output And Input Ports
-        self._mem0_output_port = Bits(int=default_value, length=self._buffer_config.MEM0_BITWIDTH)
-        self._mem1_output_port = Bits(int=default_value, length=self._buffer_config.MEM1_BITWIDTH)
-        self._mem2_input_port  = Bits(int=default_value, length=self._buffer_config.MEM2_BITWIDTH)
+    def disable_sparse_index(self) -> None:
+        self._sparse_slice_bits = None
+        self._mem0_nonzero      = None
+        self._mem0_indexed      = None
+
+    def mem0_nonzero(self, rows) -> np.ndarray:
+        # (rows x slices) bool for an Address or Array of Addresses, Slice 0
+        # the Most Significant, or None While the Index is Disabled
+        if self._mem0_nonzero is None:
+            return None
+        rows = np.asarray(rows)
+        flat = rows.reshape(-1)
+        missing = np.unique(flat[~self._mem0_indexed[flat]])
+        if len(missing):
+            slice_bytes = self._sparse_slice_bits // 8
+            words = np.asarray(self._mem0[missing])
+            self._mem0_nonzero[missing] = words.reshape(len(missing), -1, slice_bytes).any(axis=2)
+            self._mem0_indexed[missing] = True
+        return self._mem0_nonzero[rows]
+
+    def _set_mem0_image(self, image) -> None:
+        self._mem0 = image
+        if self._sparse_slice_bits is not None:
+            self._reset_sparse_index()
+
+    def _reset_sparse_index(self) -> None:
+        slices = self._buffer_config.MEM0_BITWIDTH // self._sparse_slice_bits
+        self._mem0_nonzero = np.zeros((self._buffer_config.MEM0_DEPTH, slices), dtype=bool)
+        self._mem0_indexed = np.zeros(self._buffer_config.MEM0_DEPTH, dtype=bool)
 
     def execute_instruction(self, instruction : MemoryInstruction) -> None:
         # START IMPLEMENTATION
@@ -45,6 +256,14 @@ class MainBuffer:
         # END IMPLEMENTATION
         return None
 
+    # Handling an Already Decoded Instruction (mode is a Bitwidth)
+    def execute(self, opcode : int, mode : int, mema_offset : int, memb_offset : int) -> None:
+        if opcode == MI.READ:
+            self._read(mode, mema_offset, memb_offset)
+        elif opcode == MI.WRITE:
+            self._write(mema_offset)
+        return None
+
     def _handle_read(self, instruction : MemoryInstruction) -> None:
         # START IMPLEMENTATION
         mode = Mode.bitwidth(int(instruction.get_mode().uint))
@@ -52,70 +271,212 @@ class MainBuffer:
         mema_offset = int(instruction.get_mema_offset().uint)
         memb_offset = int(instruction.get_memb_offset().uint)
 
+        self._read(mode, mema_offset, memb_offset)
+        # END IMPLEMENTATION
+        return None
+
+    def _read(self, mode : int, mema_offset : int, memb_offset : int) -> None:
         self._mem0_output_port = self._mem0[mema_offset]
         
-        if mode == 32:
-            self._mem1_output_port = self._mem1[memb_offset]
-        elif mode == 16:
-            base = memb_offset >> 1
-            sel  = memb_offset & 1
-            word = self._mem1[base]
-            half = word[:16] if sel == 1 else word[-16:]
-            self._mem1_output_port = Bits().join([half, half])
-        elif mode == 8:
-            base = memb_offset >> 2
-            sel  = memb_offset & 3
-            word = self._mem1[base]
-            bytes_msb_to_lsb = list(word.cut(8))  
-            piece = bytes_msb_to_lsb[3 - sel]     
-            self._mem1_output_port = Bits().join([piece, piece, piece, piece])
-
-        # END IMPLEMENTATION
+        width = self._buffer_config.MEM1_BITWIDTH
+        if self._broadcast_stale:
+            self._build_broadcast_tables()
+        table = self._broadcast_tables.get(mode)
+        if table is not None:
+            self._mem1_output_port = int(table[memb_offset])
+        elif mode >= width:
+            # Modes as Wide as MEM1 Pass the Word Whole. The Original Model
+            # Fixed this Test at 32 Bits; Generalizing it Only Changes MEM1
+            # Widths Other than 32, where Sub-Word Modes Now Broadcast Across
+            # the Full Width Instead of Building a 32-Bit Word
+            self._mem1_output_port = _row_to_uint(self._mem1[memb_offset])
+        else:
+            # Selecting the Sub-Word (Sub-Word 0 is the LSB) and Broadcasting it
+            # Across the Whole Word
+            lanes = width // mode
+            base  = memb_offset // lanes
+            sel   = memb_offset % lanes
+            piece = (_row_to_uint(self._mem1[base]) >> (sel * mode)) & ((1 << mode) - 1)
+            word  = 0
+            for _ in range(lanes):
+                word = (word << mode) | piece
+            self._mem1_output_port = word
         return None
 
+    def read_run(self, mode : int, mema_offset : int, mema_inc : int, memb_offset : int, memb_inc : int, count : int, skip_zero : bool = False) -> tuple:
+        # Performing count Strided READs at Once. Returns the Gathered MEM0 Rows
+        # and the (Broadcast) MEM1 Words as uint64, and Leaves the Output Ports
+        # Holding the Last Read, Exactly as count Single READs Would. With
+        # skip_zero (and the Sparse Index Enabled) Only Reads Where Both Words
+        # are Nonzero are Returned, Along with Their Mask Over the Run.
+        steps = np.arange(count, dtype=np.int64)
+        return self.read_rows(mode, mema_offset + steps * mema_inc, memb_offset + steps * memb_inc, skip_zero)
+
+    def read_rows(self, mode : int, mema : np.ndarray, memb : np.ndarray, skip_zero : bool = False) -> tuple:
+        # read_run Over Arbitrary MEM0/MEM1 Address Arrays, One READ per Entry
+        count = len(mema)
+        width = self._buffer_config.MEM1_BITWIDTH
+        if width > 64:
+            raise ValueError(f"Batched reads support MEM1 bitwidths up to 64, got {width}.")
+        if self._broadcast_stale:
+            self._build_broadcast_tables()
+        if mode in self._broadcast_tables:
+            mem1_words = self._broadcast_tables[mode][memb]
+        elif mode >= width:
+            mem1_words = _rows_to_uint64(np.asarray(self._mem1[memb]))
+        else:
+            lanes = width // mode
+            words = _rows_to_uint64(np.asarray(self._mem1[memb // lanes]))
+            pieces = (words >> ((memb % lanes) * mode).astype(np.uint64)) & np.uint64((1 << mode) - 1)
+            replicate = sum(1 << (k * mode) for k in range(lanes))
+            mem1_words = pieces * np.uint64(replicate)
+
+        self._mem1_output_port = int(mem1_words[-1])
+        if skip_zero and (self._mem0_nonzero is not None):
+            keep = self.mem0_nonzero(mema).any(axis=1) & (mem1_words != 0)
+            self._mem0_output_port = self._mem0[int(mema[-1])]
+            return np.asarray(self._mem0[mema[keep]]), mem1_words[keep], keep
+
+        mem0_rows = np.asarray(self._mem0[mema])
+        self._mem0_output_port = mem0_rows[-1]
+        if skip_zero:
+            return mem0_rows, mem1_words, np.ones(count, dtype=bool)
+        return mem0_rows, mem1_words
+
     def _handle_write(self, instruction : MemoryInstruction) -> None:
         # START IMPLEMENTATION
         # This instruction indicates that the output data from the PEs should be written to MEM2 at the address pointed to by MemAOffset.
         addr = instruction.get_mema_offset().uint
-        self._mem2[addr] = self._mem2_input_port
+        self._write(addr)
         # END IMPLEMENTATION
         return None
 
+    def _write(self, addr : int) -> None:
+        self._mem2[addr] = self._mem2_input_port
+        self._mem2_dirty.add(addr)
+        return None
+
     def read_mem0_output(self) -> Bits:
+        return _row_to_bits(self._mem0_output_port, self._buffer_config.MEM0_BITWIDTH)
+
+    def read_mem0_row(self) -> np.ndarray:
+        # MEM0 Output Port as the Packed Row Itself, Without Building Bits
         return self._mem0_output_port
 
     def read_mem1_output(self) -> Bits:
+        return Bits(uint=self._mem1_output_port, length=self._buffer_config.MEM1_BITWIDTH)
+
+    def read_mem1_word(self) -> int:
+        # MEM1 Output Port as an Unsigned Int, Without Building Bits
         return self._mem1_output_port
 
     def write_mem2_output(self, value : Bits) -> None:
-        self._mem2_input_port = value
+        self._mem2_input_port = _uint_to_row(value.uint, self._buffer_config.MEM2_BITWIDTH)
+
+    def write_mem2_row(self, row : np.ndarray) -> None:
+        # Packed MEM2 Row (Big-Endian uint8), Kept as a View Until Written
+        self._mem2_input_port = row
 
     def set_mem0(self, mem : list[int]) -> None:
         # Ensuring the Memory List is the Proper Length and Writing
         if len(mem) != self._buffer_config.MEM0_DEPTH:
             raise ValueError(f"Length of Memory [{len(mem)}] is incorrect for depth [{self._buffer_config.MEM0_DEPTH}] ")
-        self._mem0 = [Bits(int=elem, length=self._buffer_config.MEM0_BITWIDTH) for elem in mem]
+        self._set_mem0_image(_pack_words(_signed_to_unsigned(mem, self._buffer_config.MEM0_BITWIDTH), self._buffer_config.MEM0_BITWIDTH))
 
     def set_mem1(self, mem : list[int]) -> None:
         # Ensuring the Memory List is the Proper Length and Writing
         if len(mem) != self._buffer_config.MEM1_DEPTH:
             raise ValueError(f"Length of Memory [{len(mem)}] is incorrect for depth [{self._buffer_config.MEM1_DEPTH}] ")
-        self._mem1 = [Bits(int=elem, length=self._buffer_config.MEM1_BITWIDTH) for elem in mem]
+        self._set_mem1_image(_pack_words(_signed_to_unsigned(mem, self._buffer_config.MEM1_BITWIDTH), self._buffer_config.MEM1_BITWIDTH))
 
     def set_mem0_bits(self, mem : list[Bits]) -> None:
         # Ensuring the Memory List is the Proper Length and Writing
         if len(mem) != self._buffer_config.MEM0_DEPTH:
             raise ValueError(f"Length of Memory [{len(mem)}] is incorrect for depth [{self._buffer_config.MEM0_DEPTH}] ")
-        self._mem0 = mem
+        self._set_mem0_image(_pack_words([elem.uint for elem in mem], self._buffer_config.MEM0_BITWIDTH))
 
     def set_mem1_bits(self, mem : list[Bits]) -> None:
         # Ensuring the Memory List is the Proper Length and Writing
         if len(mem) != self._buffer_config.MEM1_DEPTH:
             raise ValueError(f"Length of Memory [{len(mem)}] is incorrect for depth [{self._buffer_config.MEM1_DEPTH}] ")
-        self._mem1 = mem
+        self._set_mem1_image(_pack_words([elem.uint for elem in mem], self._buffer_config.MEM1_BITWIDTH))
+
+    def _check_image(self, image : np.ndarray, width : int, depth : int) -> np.ndarray:
+        image = np.asarray(image)
+        if (image.dtype != np.uint8) or (image.shape != (depth, _word_bytes(width))):
+            raise ValueError(f"Memory image of shape {image.shape} and dtype {image.dtype} is incorrect for depth [{depth}] and bitwidth [{width}] ")
+        return image
+
+    def set_mem0_array(self, image : np.ndarray) -> None:
+        # Taking a Packed (DEPTH x bytes) uint8 Image as-is, Without Copying
+        self._set_mem0_image(self._check_image(image, self._buffer_config.MEM0_BITWIDTH, self._buffer_config.MEM0_DEPTH))
+
+    def set_mem1_array(self, image : np.ndarray) -> None:
+        # Taking a Packed (DEPTH x bytes) uint8 Image as-is, Without Copying
+        self._set_mem1_image(self._check_image(image, self._buffer_config.MEM1_BITWIDTH, self._buffer_config.MEM1_DEPTH))
+
+    def read_mem2_array(self) -> np.ndarray:
+        return self._mem2.copy()
+
+    def read_mem2_delta(self) -> tuple:
+        # Only the Words Written Since the Previous Call, as (Sorted Addresses,
+        # Packed Rows), so Polling Costs O(writes) Instead of O(depth)
+        addresses = np.array(sorted(self._mem2_dirty), dtype=np.int64)
+        self._mem2_dirty = set()
+        return addresses, self._mem2[addresses]
+
+    def get_state(self) -> dict:
+        # Memories and Ports as Packed Arrays, for Checkpointing
+        return {
+            "mem0"      : np.asarray(self._mem0),
+            "mem1"      : np.asarray(self._mem1),
+            "mem2"      : self._mem2.copy(),
+            "mem0_port" : np.array(self._mem0_output_port),
+            "mem1_port" : _uint_to_row(self._mem1_output_port, self._buffer_config.MEM1_BITWIDTH),
+            "mem2_port" : np.array(self._mem2_input_port, dtype=np.uint8),
+        }
+
+    def check_state(self, state : dict) -> None:
+        # Raising KeyError/ValueError for a State set_state Cannot Restore
+        buf_config = self._buffer_config
+        images = [("mem2", buf_config.MEM2_BITWIDTH, buf_config.MEM2_DEPTH)]
+        images += [(name, width, depth) for name, width, depth in [
+            ("mem0", buf_config.MEM0_BITWIDTH, buf_config.MEM0_DEPTH),
+            ("mem1", buf_config.MEM1_BITWIDTH, buf_config.MEM1_DEPTH),
+        ] if name in state]
+        for name, width, depth in images:
+            self._check_image(state[name], width, depth)
+        for name, width in [("mem0_port", buf_config.MEM0_BITWIDTH), ("mem1_port", buf_config.MEM1_BITWIDTH), ("mem2_port", buf_config.MEM2_BITWIDTH)]:
+            if np.shape(state[name]) != (_word_bytes(width),):
+                raise ValueError(f"Port {name} of shape {np.shape(state[name])} is incorrect for bitwidth [{width}] ")
+
+    def set_state(self, state : dict) -> None:
+        # MEM0/MEM1 are Left as They are When the State Omits Them
+        self.check_state(state)
+        if "mem0" in state:
+            self.set_mem0_array(state["mem0"])
+        if "mem1" in state:
+            self.set_mem1_array(state["mem1"])
+        self._mem2 = np.array(state["mem2"], dtype=np.uint8)
+        self._mem0_output_port = np.array(state["mem0_port"], dtype=np.uint8)
+        self._mem1_output_port = _row_to_uint(state["mem1_port"])
+        self._mem2_input_port  = np.array(state["mem2_port"], dtype=np.uint8)
+
+        # Every Restored Word Counts as Changed
+        self._mem2_dirty = set(range(self._buffer_config.MEM2_DEPTH))
+
+    def load_mem0(self, path : str) -> None:
+        # Memory-Mapping a mem0.bits/.npy Image, Words are Read Lazily from the Mapping
+        self._set_mem0_image(_load_memory_image(path, self._buffer_config.MEM0_BITWIDTH, self._buffer_config.MEM0_DEPTH))
+
+    def load_mem1(self, path : str) -> None:
+        # Memory-Mapping a mem1.bits/.npy Image, Words are Read Lazily from the Mapping
+        self._set_mem1_image(_load_memory_image(path, self._buffer_config.MEM1_BITWIDTH, self._buffer_config.MEM1_DEPTH))
 
     def read_mem2(self) -> list[int]:
-        return [elem.int for elem in self._mem2]
+        width = self._buffer_config.MEM2_BITWIDTH
+        sign = 1 << (width - 1)
+        return [(value ^ sign) - sign for value in map(_row_to_uint, self._mem2)]
 
     def read_mem2_bits(self) -> list[Bits]:
-        return self._mem2
\ No newline at end of file
+        return [_row_to_bits(row, self._buffer_config.MEM2_BITWIDTH) for row in self._mem2]
@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from .instruction import MI, PEI
+from .decoded_instruction import DecodedInstruction
+import numpy as np
+
+# Big-Endian Signed Dtypes for Each Mode
+_MODE_DTYPES = {8 : ">i1", 16 : ">i2", 32 : ">i4"}
+
+
+@dataclass
+class MatvecPlan:
+
+    # How a (rows x cols) Matrix is Tiled onto the Accelerator. Each PE Lane
+    # Owns One Output Row, so a Row Tile Covers PE_COUNT * lanes Rows. The
+    # Reduction Dimension is Split into k_chunk Long Pieces, and Each MEM0
+    # Load Holds tiles_per_load Row Tiles of One Piece.
+
+    mode           : int
+    lanes          : int
+    rows_per_tile  : int
+    k_chunk        : int
+    row_tiles      : int
+    k_chunks       : int
+    tiles_per_load : int
+
+    @property
+    def padded_rows(self) -> int:
+        return self.row_tiles * self.rows_per_tile
+
+    @property
+    def padded_cols(self) -> int:
+        return self.k_chunks * self.k_chunk
+
+
+def plan_matvec(config, rows : int, cols : int, mode : int) -> MatvecPlan:
+    pe_config  = config.PE_CONFIG
+    buf_config = config.BUFFER_CONFIG
+
+    # Checking the Mode and that OUT Keeps Every Lane
+    if mode not in _MODE_DTYPES:
+        raise ValueError(f"Unsupported mode [{mode}], expected one of {list(_MODE_DTYPES)}.")
+    if pe_config.OUTPUT_BITWIDTH < pe_config.INPUT_BITWIDTH:
+        raise ValueError(f"Output bitwidth {pe_config.OUTPUT_BITWIDTH} drops lanes of input bitwidth {pe_config.INPUT_BITWIDTH}.")
+
+    # Limiting the Reduction Piece by MEM0/MEM1 Depth and the Counter Range
+    lanes = pe_config.INPUT_BITWIDTH // mode
+    mem1_slots = buf_config.MEM1_DEPTH * max(1, buf_config.MEM1_BITWIDTH // mode)
+    k_chunk = min(cols, buf_config.MEM0_DEPTH, mem1_slots, 1 << config.COUNTER_BITWIDTH)
+
+    rows_per_tile = config.PE_COUNT * lanes
+    return MatvecPlan(
+        mode           = mode,
+        lanes          = lanes,
+        rows_per_tile  = rows_per_tile,
+        k_chunk        = k_chunk,
+        row_tiles      = -(-rows // rows_per_tile),
+        k_chunks       = -(-cols // k_chunk),
+        tiles_per_load = min(buf_config.MEM0_DEPTH // k_chunk, buf_config.MEM2_DEPTH),
+    )
+
+def _check_range(values : np.ndarray, mode : int, name : str) -> None:
+    low, high = -(1 << (mode - 1)), (1 << (mode - 1))
+    if values.size and ((values.min() < low) or (values.max() >= high)):
+        raise ValueError(f"{name} values must fit in signed {mode} bit lanes.")
+
+def pack_matrix_loads(config, plan : MatvecPlan, matrix : np.ndarray) -> list[tuple]:
+    # Packing Every MEM0 Load Up Front. Returns (first tile, tile count, k
+    # piece, MEM0 image) per Load. Word t * k_chunk + k Holds Column k of
+    # Tile t, PE 0 in the Most Significant Slice and Lane 0 First.
+    _check_range(matrix, plan.mode, "Matrix")
+    padded = np.zeros((plan.padded_rows, plan.padded_cols), dtype=np.int64)
+    padded[:matrix.shape[0], :matrix.shape[1]] = matrix
+
+    buf_config = config.BUFFER_CONFIG
+    row_bytes = buf_config.MEM0_BITWIDTH // 8
+    loads = []
+    for kc in range(plan.k_chunks):
+        for t0 in range(0, plan.row_tiles, plan.tiles_per_load):
+            tiles = min(plan.tiles_per_load, plan.row_tiles - t0)
+            block = padded[t0 * plan.rows_per_tile : (t0 + tiles) * plan.rows_per_tile, kc * plan.k_chunk : (kc + 1) * plan.k_chunk]
+            loads.append((t0, tiles, kc, _pack_tiles(block, plan, buf_config.MEM0_DEPTH, row_bytes)))
+    return loads
+
+def _pack_tiles(block : np.ndarray, plan : MatvecPlan, depth : int, row_bytes : int) -> np.ndarray:
+    # Word t * columns + k of the Image Holds Column k of Tile t
+    tiles = block.shape[0] // plan.rows_per_tile
+    block = block.reshape(tiles, plan.rows_per_tile, block.shape[1]).transpose(0, 2, 1)
+    words = np.ascontiguousarray(block).astype(_MODE_DTYPES[plan.mode]).view(np.uint8).reshape(-1, row_bytes)
+    image = np.zeros((depth, row_bytes), dtype=np.uint8)
+    image[:words.shape[0]] = words
+    return image
+
+def pack_vector(config, plan : MatvecPlan, vector : np.ndarray, kc : int) -> np.ndarray:
+    # Packing One Reduction Piece of a Vector into MEM1. Sub-Word j of a Word
+    # Sits at Bits [j * mode, (j + 1) * mode), so Sub-Word 0 is the LSB.
+    return _pack_mem1(config, plan.mode, vector[kc * plan.k_chunk : (kc + 1) * plan.k_chunk])
+
+def _pack_mem1(config, mode : int, values : np.ndarray) -> np.ndarray:
+    buf_config = config.BUFFER_CONFIG
+    per_word = max(1, buf_config.MEM1_BITWIDTH // mode)
+    piece = np.zeros(buf_config.MEM1_DEPTH * per_word, dtype=np.int64)
+    piece[:len(values)] = values
+    words = piece.reshape(-1, per_word)[:, ::-1]
+    return np.ascontiguousarray(words).astype(_MODE_DTYPES[mode]).view(np.uint8).reshape(buf_config.MEM1_DEPTH, -1)
+
+def matvec_program(plan : MatvecPlan, tiles : int, shift : int = 0) -> list[DecodedInstruction]:
+    # Per Tile: Clear, One Counted READ+MAC over the Piece, Optional Rounding
+    # Shift, OUT, then WRITE the Joined Outputs to MEM2[tile]
+    mode = plan.mode
+    program = []
+    for t in range(tiles):
+        program.append(DecodedInstruction(MI.NOP, mode, 0, 0, PEI.NO_VALUE, mode, PEI.CLR))
+        program.append(DecodedInstruction(MI.READ, mode, t * plan.k_chunk, 0, PEI.NO_VALUE, mode, PEI.MAC, plan.k_chunk - 1, 1, 1))
+        if shift:
+            program.append(DecodedInstruction(MI.NOP, mode, 0, 0, PEI.RND, mode, shift))
+        program.append(DecodedInstruction(MI.NOP, mode, 0, 0, PEI.NO_VALUE, mode, PEI.OUT))
+        program.append(DecodedInstruction(MI.WRITE, mode, t, 0, PEI.NO_VALUE, mode, PEI.NOP))
+    return program
+
+def unpack_outputs(config, plan : MatvecPlan, mem2 : np.ndarray, tiles : int) -> np.ndarray:
+    # Each PE Output Holds its Lanes (MSB Lane First) in the Low INPUT_BITWIDTH Bits
+    pe_config = config.PE_CONFIG
+    out_bytes = pe_config.OUTPUT_BITWIDTH // 8
+    in_bytes = pe_config.INPUT_BITWIDTH // 8
+    words = np.ascontiguousarray(mem2[:tiles].reshape(tiles, config.PE_COUNT, out_bytes)[:, :, out_bytes - in_bytes:])
+    return words.view(_MODE_DTYPES[plan.mode]).astype(np.int64).reshape(-1)
+
+def wrap_to_mode(values : np.ndarray, mode : int) -> np.ndarray:
+    half = 1 << (mode - 1)
+    return ((values + half) & ((1 << mode) - 1)) - half
+
+
+@dataclass
+class CompiledMatvec:
+
+    # One Matvec Compiled onto the Accelerator with the Same Tiling as
+    # run_matvec. Each Load is (first tile, tile count, k piece, MEM0 image,
+    # MEM1 image, program), and Partial Sums of the k Pieces are Added on the
+    # Host, then Wrapped to the Mode.
+
+    plan  : MatvecPlan
+    rows  : int
+    loads : list[tuple]
+
+def compile_matvec(config, matrix : np.ndarray, vector : np.ndarray, mode : int, shift : int = 0) -> CompiledMatvec:
+    matrix = np.asarray(matrix, dtype=np.int64)
+    vector = np.asarray(vector, dtype=np.int64).reshape(-1)
+    if matrix.ndim != 2 or matrix.shape[1] != len(vector):
+        raise ValueError(f"Matrix of shape {matrix.shape} does not match vector of length {len(vector)}.")
+    _check_range(vector, mode, "Vector")
+
+    plan = plan_matvec(config, matrix.shape[0], matrix.shape[1], mode)
+    if shift and plan.k_chunks > 1:
+        raise ValueError(f"Rounding shift needs the full reduction ({matrix.shape[1]}) in one piece of at most {plan.k_chunk}.")
+
+    # Every Load Holding the Same Number of Tiles Shares One Program
+    mem1_images = [pack_vector(config, plan, vector, kc) for kc in range(plan.k_chunks)]
+    programs = {}
+    loads = []
+    for t0, tiles, kc, mem0_image in pack_matrix_loads(config, plan, matrix):
+        if tiles not in programs:
+            programs[tiles] = matvec_program(plan, tiles, shift)
+        loads.append((t0, tiles, kc, mem0_image, mem1_images[kc], programs[tiles]))
+    return CompiledMatvec(plan, matrix.shape[0], loads)
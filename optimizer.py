@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+from .decoded_instruction import DecodedInstruction, InstructionDecoder, InstructionLayout
+from .instruction import MI, PEI
+from .pipeline import PipelineConfiguration, program_cycles
+import numpy as np
+
+# Peephole Optimizer over Decoded Programs. Every Rewrite is Exact Under the
+# Accelerator's Semantics: an Iteration Writes MEM2 (Before the PE Op), Reads
+# MEM0/MEM1 Into the PE Inputs, then Runs the PE Op, and PE Ops Only Change
+# the Accumulator and Output Registers. Rewrites Repeat Until None Applies.
+
+# PE Ops that Give the Same Result When Repeated Without a New Read
+_IDEMPOTENT = {PEI.NOP, PEI.CLR, PEI.OUT, PEI.PASS}
+
+
+@dataclass
+class OptimizationReport:
+    instructions_before : int
+    instructions_after  : int
+    cycles_before       : int
+    cycles_after        : int
+    rewrites            : dict = field(default_factory=dict)
+
+    @property
+    def cycles_saved(self) -> int:
+        return self.cycles_before - self.cycles_after
+
+
+def _pe_op(decoded : DecodedInstruction) -> int:
+    # PEI Value of a Plain Op, -1 for RND, PEI.NOP for Values with no Handler
+    if decoded.pe_opcode != PEI.NO_VALUE:
+        return -1
+    return decoded.pe_value if decoded.pe_value in (PEI.MAC, PEI.OUT, PEI.PASS, PEI.CLR) else PEI.NOP
+
+def _mem_op(decoded : DecodedInstruction) -> int:
+    return decoded.mem_opcode if decoded.mem_opcode in (MI.READ, MI.WRITE) else MI.NOP
+
+def _with(decoded : DecodedInstruction, **fields) -> DecodedInstruction:
+    values = {name : getattr(decoded, name) for name in DecodedInstruction.__slots__}
+    values.update(fields)
+    return DecodedInstruction(**values)
+
+def _canonical(decoded : DecodedInstruction) -> DecodedInstruction:
+    # Zeroing Fields the Semantics Ignore, so Equal Effects Compare Equal
+    mem_op, pe_op = _mem_op(decoded), _pe_op(decoded)
+    fields = {}
+    if decoded.count == 0:
+        fields.update(mema_inc=0, memb_inc=0)
+    if mem_op == MI.NOP:
+        fields.update(mem_opcode=MI.NOP, mem_mode=decoded.pe_mode, mema_offset=0, memb_offset=0, mema_inc=0, memb_inc=0)
+    elif mem_op == MI.WRITE:
+        fields.update(memb_offset=0, memb_inc=0)
+    if pe_op in (PEI.NOP, PEI.CLR):
+        fields.update(pe_value=pe_op)
+    return _with(decoded, **fields) if fields else decoded
+
+def _collapse(decoded : DecodedInstruction, layout : InstructionLayout, rewrites : dict) -> DecodedInstruction:
+    # Counted Instructions Whose Earlier Iterations are Overwritten by the Last
+    if decoded.count == 0:
+        return decoded
+    mem_op, pe_op = _mem_op(decoded), _pe_op(decoded)
+    last_a = decoded.mema_offset + decoded.count * decoded.mema_inc
+    last_b = decoded.memb_offset + decoded.count * decoded.memb_inc
+    if (last_a > layout.field_max("mema_offset")) or (last_b > layout.field_max("memb_offset")):
+        return decoded
+    if (mem_op == MI.NOP and pe_op in _IDEMPOTENT) or (mem_op == MI.READ and pe_op in _IDEMPOTENT):
+        rule = "collapse_idempotent"
+    elif mem_op == MI.WRITE and decoded.mema_inc == 0 and pe_op in (PEI.NOP, PEI.PASS):
+        rule = "collapse_rewrite"
+    else:
+        return decoded
+    rewrites[rule] = rewrites.get(rule, 0) + 1
+    return _with(decoded, mema_offset=last_a, memb_offset=last_b, count=0, mema_inc=0, memb_inc=0)
+
+def _continues(first : DecodedInstruction, second : DecodedInstruction, max_count : int) -> bool:
+    # second Picks Up Exactly Where first's Address Cursors Stop
+    if first.count + second.count + 1 > max_count:
+        return False
+    steps = first.count + 1
+    return (
+        _with(second, mema_offset=0, memb_offset=0, count=0) == _with(first, mema_offset=0, memb_offset=0, count=0)
+        and second.mema_offset == first.mema_offset + steps * first.mema_inc
+        and second.memb_offset == first.memb_offset + steps * first.memb_inc
+    )
+
+def _pair(first : DecodedInstruction, second : DecodedInstruction, max_count : int, rewrites : dict):
+    # Replacement for Two Adjacent Instructions, or None
+    first_mem, first_pe = _mem_op(first), _pe_op(first)
+    second_mem, second_pe = _mem_op(second), _pe_op(second)
+
+    # Merging Adjacent Runs into One Longer count (the Increments of a
+    # Single Iteration are Free to Take the Other Run's Values)
+    inc = first if first.count > 0 else second
+    same_inc = (first.count == 0) or (second.count == 0) or ((first.mema_inc, first.memb_inc) == (second.mema_inc, second.memb_inc))
+    if same_inc and _continues(_with(first, mema_inc=inc.mema_inc, memb_inc=inc.memb_inc), _with(second, mema_inc=inc.mema_inc, memb_inc=inc.memb_inc), max_count):
+        rewrites["merge_count"] = rewrites.get("merge_count", 0) + 1
+        return [_with(first, count=first.count + second.count + 1, mema_inc=inc.mema_inc, memb_inc=inc.memb_inc)]
+
+    # A Memory-Only Step Followed by a PE-Only Step Runs as One Iteration
+    if first.count == 0 and second.count == 0 and first_pe == PEI.NOP and second_mem == MI.NOP:
+        rewrites["fold_pe_op"] = rewrites.get("fold_pe_op", 0) + 1
+        return [_with(first, pe_opcode=second.pe_opcode, pe_mode=second.pe_mode, pe_value=second.pe_value)]
+
+    # PE Work Overwritten Before Anything Observes it: CLR Resets Both
+    # Registers, PASS Resets the Accumulator
+    if first_mem == MI.NOP and second_mem != MI.WRITE:
+        if second_pe == PEI.CLR or (second_pe == PEI.PASS and first_pe in (PEI.MAC, PEI.PASS, -1)):
+            rewrites["drop_dead"] = rewrites.get("drop_dead", 0) + 1
+            return [second]
+
+    # OUT and RND of a Cleared Accumulator Change Nothing
+    if first_mem == MI.NOP and first_pe == PEI.CLR and second_mem == MI.NOP and second_pe in (PEI.OUT, -1):
+        rewrites["drop_after_clr"] = rewrites.get("drop_after_clr", 0) + 1
+        return [first]
+    return None
+
+def optimize_program(program : list, inst_config, pipeline_config : PipelineConfiguration = None) -> tuple:
+    # Returns (Optimized Decoded Program, OptimizationReport). Instructions
+    # are Decoded First if Needed; Every Rewritten Field Stays Within the
+    # Widths of inst_config, so the Result Always Encodes
+    if program and not isinstance(program[0], DecodedInstruction):
+        program = InstructionDecoder().decode_program(program)
+    layout = InstructionLayout(inst_config)
+    max_count = layout.field_max("count")
+    rewrites = {}
+
+    current = list(program)
+    changed = True
+    while changed:
+        changed = False
+
+        # Single-Instruction Rewrites
+        simplified = []
+        for decoded in current:
+            if _mem_op(decoded) == MI.NOP and _pe_op(decoded) == PEI.NOP:
+                rewrites["drop_nop"] = rewrites.get("drop_nop", 0) + 1
+                changed = True
+                continue
+            collapsed = _collapse(_canonical(decoded), layout, rewrites)
+            changed |= collapsed != decoded
+            simplified.append(collapsed)
+
+        # Pairwise Rewrites, Re-Examining the Result Against the Next
+        result = []
+        for decoded in simplified:
+            while result:
+                replacement = _pair(result[-1], decoded, max_count, rewrites)
+                if replacement is None:
+                    break
+                changed = True
+                result.pop()
+                decoded = replacement[0]
+            result.append(decoded)
+        current = result
+
+    report = OptimizationReport(
+        instructions_before = len(program),
+        instructions_after  = len(current),
+        cycles_before       = program_cycles(program, pipeline_config),
+        cycles_after        = program_cycles(current, pipeline_config),
+        rewrites            = rewrites,
+    )
+    return current, report
+
+
+def check_equivalence(config, original : list, optimized : list, seed : int = 0, trials : int = 2, vectorized : bool = True) -> bool:
+    # Running Both Programs from the Same Random Memories and Registers and
+    # Comparing the Complete Final State
+    from .accelerator import Accelerator
+    if original and not isinstance(original[0], DecodedInstruction):
+        original = InstructionDecoder().decode_program(original)
+
+    buf_config = config.BUFFER_CONFIG
+    rng = np.random.default_rng(seed)
+    for _ in range(trials):
+        images = [
+            rng.integers(0, 256, (depth, (width + 7) // 8), dtype=np.uint8)
+            for width, depth in [
+                (buf_config.MEM0_BITWIDTH, buf_config.MEM0_DEPTH),
+                (buf_config.MEM1_BITWIDTH, buf_config.MEM1_DEPTH),
+                (buf_config.MEM2_BITWIDTH, buf_config.MEM2_DEPTH),
+            ]
+        ]
+        mode = config.PE_CONFIG.INPUT_BITWIDTH if config.PE_CONFIG.INPUT_BITWIDTH in (8, 16, 32) else 8
+        preamble = [
+            DecodedInstruction(MI.READ, mode, int(rng.integers(buf_config.MEM0_DEPTH)), 0, PEI.NO_VALUE, mode, PEI.PASS),
+            DecodedInstruction(MI.NOP, mode, 0, 0, PEI.NO_VALUE, mode, PEI.OUT),
+            DecodedInstruction(MI.READ, mode, int(rng.integers(buf_config.MEM0_DEPTH)), 0, PEI.NO_VALUE, mode, PEI.MAC),
+        ]
+
+        states = []
+        for program in (original, optimized):
+            accelerator = Accelerator(config, vectorized=vectorized)
+            accelerator.set_mem0_array(images[0])
+            accelerator.set_mem1_array(images[1])
+            accelerator._main_buffer.set_state(dict(accelerator._main_buffer.get_state(), mem2=images[2]))
+            for decoded in preamble + list(program):
+                accelerator.execute_decoded_instruction(decoded)
+            states.append(accelerator._checkpoint_state())
+
+        if any(not np.array_equal(states[0][name], states[1][name]) for name in states[0]):
+            return False
+    return True
@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from .decoded_instruction import DecodedInstruction
+from .instruction import MI, PEI
+
+# Opt-In Timing Model of the RTL. verilog/controller.sv Spends One IDLE Cycle
+# Accepting Each Instruction, then count + 1 EXECUTING Cycles Issuing it to the
+# Buffer and PEs. verilog/processing_element.sv Registers its Instruction
+# (pe_inst_ff) to Line Up with the Registered SRAM Reads in verilog/buffer.sv,
+# so Every PE Operation Executes PE_LATENCY Cycles After it is Issued and the
+# Last One Drains After the Controller Goes Idle. Cycles are Counted from the
+# IDLE Cycle that Accepts the First Instruction, Assuming the Instruction
+# Memory (not in this Tree) Presents the Next Instruction by the Following
+# IDLE Cycle. Values are Still Computed by the Functional Model, so Counting
+# Costs O(1) per Instruction Regardless of count.
+
+@dataclass
+class PipelineConfiguration:
+    DISPATCH_CYCLES : int = 1
+    PE_LATENCY      : int = 1
+
+    def validate(self) -> None:
+        if (self.DISPATCH_CYCLES < 0) or (self.PE_LATENCY < 0):
+            raise ValueError(f"Pipeline latencies must be non-negative, got dispatch {self.DISPATCH_CYCLES} and PE {self.PE_LATENCY}.")
+
+
+class CycleModel:
+
+    def __init__(self, config : PipelineConfiguration = None, record : bool = False):
+        self._config = config or PipelineConfiguration()
+        self._config.validate()
+        self._record = record
+        self.reset()
+
+    def reset(self) -> None:
+        self.clock           = 0
+        self.instructions    = 0
+        self.issue_cycles    = 0
+        self.dispatch_cycles = 0
+        self.read_cycles     = 0
+        self.write_cycles    = 0
+        self._last_pe_end    = None
+        self.timeline        = []
+
+    def issue(self, decoded : DecodedInstruction) -> tuple:
+        # Advancing the Clock Through One Instruction; Returns the (First, Last)
+        # Cycle it Occupies the Buffer and PE Instruction Buses
+        cycles = decoded.count + 1
+        start = self.clock + self._config.DISPATCH_CYCLES
+        end = start + cycles - 1
+        self.clock = end + 1
+
+        self.instructions += 1
+        self.issue_cycles += cycles
+        self.dispatch_cycles += self._config.DISPATCH_CYCLES
+        if decoded.mem_opcode == MI.READ:
+            self.read_cycles += cycles
+        elif decoded.mem_opcode == MI.WRITE:
+            self.write_cycles += cycles
+        if (decoded.pe_opcode != PEI.NO_VALUE) or (decoded.pe_value != PEI.NOP):
+            self._last_pe_end = end
+        if self._record:
+            self.timeline.append((start, end))
+        return (start, end)
+
+    @property
+    def drain_cycles(self) -> int:
+        # Cycles the Last PE Operation Outlives the Controller
+        if self._last_pe_end is None:
+            return 0
+        return max(self._last_pe_end + 1 + self._config.PE_LATENCY - self.clock, 0)
+
+    @property
+    def cycles(self) -> int:
+        return self.clock + self.drain_cycles
+
+    def report(self) -> dict:
+        cycles = max(self.cycles, 1)
+        return {
+            "cycles"            : self.cycles,
+            "instructions"      : self.instructions,
+            "issue_cycles"      : self.issue_cycles,
+            "dispatch_cycles"   : self.dispatch_cycles,
+            "drain_cycles"      : self.drain_cycles,
+            "read_cycles"       : self.read_cycles,
+            "write_cycles"      : self.write_cycles,
+            "issue_utilization" : self.issue_cycles / cycles,
+        }
+
+
+def program_cycles(program : list[DecodedInstruction], config : PipelineConfiguration = None) -> int:
+    # RTL Cycle Count of a Program, Without Executing it
+    model = CycleModel(config)
+    for decoded in program:
+        model.issue(decoded)
+    return model.cycles
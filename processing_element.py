@@ -1,6 +1,7 @@
 from bitstring import Bits, BitArray
 from .instruction import ProcessingElementInstruction, PEI
 from dataclasses import dataclass
+import numpy as np
 
 @dataclass
 class ProcessingElementConfiguration:
@@ -28,6 +29,26 @@ class ProcessingElement:
     def input_a(self, value : Bits) -> None:
         self._input_a_value = value
 
+    def input_a_lane(self, bus : Bits, index : int) -> None:
+        # Sharing the Whole MEM0 Bus Instead of Copying this PE's Slice; Lanes
+        # are Read at an Offset and the Slice is Only Cut if it is Requested
+        self._input_a_bus = bus
+        self._input_a_start = index * self._config.INPUT_BITWIDTH
+        self._input_a_slice = None
+
+    @property
+    def _input_a_value(self) -> Bits:
+        if self._input_a_slice is None:
+            start = self._input_a_start
+            self._input_a_slice = self._input_a_bus[start : start + self._config.INPUT_BITWIDTH]
+        return self._input_a_slice
+
+    @_input_a_value.setter
+    def _input_a_value(self, value : Bits) -> None:
+        self._input_a_bus = value
+        self._input_a_start = 0
+        self._input_a_slice = value
+
     def input_b(self, value : Bits) -> None:
         self._input_b_value = value
 
@@ -35,21 +56,26 @@ class ProcessingElement:
     def execute_instruction(self, instruction : ProcessingElementInstruction) -> None:
         # START IMPLEMENTATION
         opcode = instruction.get_opcode().uint
+        value = instruction.get_value().uint
+        self.execute(opcode, instruction.get_mode_bitwidth(), value)
+        # END IMPLEMENTATION
+        return None
+
+    # Handling an Already Decoded Instruction
+    def execute(self, opcode : int, mode : int, value : int) -> None:
         if opcode == PEI.NO_VALUE:
-            value = instruction.get_value().uint
             if value == PEI.MAC:
-                self._handle_mac(instruction)
+                self._handle_mac(mode)
             elif value == PEI.NOP:
                 pass 
             elif value == PEI.OUT:
-                self._handle_out(instruction)
+                self._handle_out(mode)
             elif value == PEI.PASS:
-                self._handle_pass(instruction)
+                self._handle_pass(mode)
             elif value == PEI.CLR:
-                self._handle_clr(instruction)
+                self._handle_clr()
         else:
-            self._handle_rnd(instruction)
-        # END IMPLEMENTATION
+            self._handle_rnd(mode, value)
         return None
 
     # defined helper function here:
@@ -59,14 +85,14 @@ class ProcessingElement:
         end =  total_bw - (channel_num) * channel_width
         return start, end
 
-    def _handle_mac(self, instruction : ProcessingElementInstruction):
+    def _handle_mac(self, mode : int):
         # START IMPLEMENTATION
-        mode = instruction.get_mode_bitwidth()
         num_channels = self._config.INPUT_BITWIDTH // mode 
         vacc_width = self._config.ACCUMULATION_BITWIDTH // num_channels
+        a_bus, a_start = self._input_a_bus, self._input_a_start
 
         for i in range(num_channels):
-            a_val = self._input_a_value[i * mode : i * mode + mode].int
+            a_val = a_bus[a_start + i * mode : a_start + i * mode + mode].int
             b_val = self._input_b_value[i * mode : i * mode + mode].int
             acc_val = self._acc_value[i * vacc_width : i * vacc_width + vacc_width].int
 
@@ -79,9 +105,8 @@ class ProcessingElement:
         # END IMPLEMENTATION
         return None
 
-    def _handle_out(self, instruction : ProcessingElementInstruction):
+    def _handle_out(self, mode : int):
         # START IMPLEMENTATION
-        mode = instruction.get_mode_bitwidth()
         num_channels = self._config.INPUT_BITWIDTH // mode 
         vacc_width = self._config.ACCUMULATION_BITWIDTH // num_channels
 
@@ -98,22 +123,22 @@ class ProcessingElement:
         # END IMPLEMENTATION
         return None
 
-    def _handle_pass(self, instruction : ProcessingElementInstruction):
+    def _handle_pass(self, mode : int):
         # START IMPLEMENTATION
-        mode = instruction.get_mode_bitwidth()
         num_channels = self._config.INPUT_BITWIDTH // mode 
         vacc_width = self._config.ACCUMULATION_BITWIDTH // num_channels
         result = BitArray()
+        a_bus, a_start = self._input_a_bus, self._input_a_start
 
         for i in reversed(range(num_channels)):
             start, end = self.get_indices(i, self._config.INPUT_BITWIDTH, mode, num_channels)
-            result.append(BitArray(int=self._input_a_value[start:end].int, length=vacc_width))
+            result.append(BitArray(int=a_bus[a_start + start : a_start + end].int, length=vacc_width))
 
         self._acc_value = result
         # END IMPLEMENTATION
         return None
 
-    def _handle_clr(self, instruction : ProcessingElementInstruction):
+    def _handle_clr(self):
         # START IMPLEMENTATION
 
         # Set to zero 
@@ -123,10 +148,8 @@ class ProcessingElement:
         # END IMPLEMENTATION
         return None
 
-    def _handle_rnd(self, instruction : ProcessingElementInstruction):
+    def _handle_rnd(self, mode : int, shift_val : int):
         # START IMPLEMENTATION
-        shift_val = instruction.get_value().uint
-        mode = instruction.get_mode_bitwidth()
         num_channels = self._config.INPUT_BITWIDTH // mode
         vacc_width = self._config.ACCUMULATION_BITWIDTH // num_channels
 
@@ -142,4 +165,143 @@ class ProcessingElement:
         return self._output_value
 
     def get_accumulation(self) -> Bits:
-        return self._acc_value
\ No newline at end of file
+        return self._acc_value
+
+    def get_registers(self) -> tuple:
+        # (input a, input b, accumulation, output), for Checkpointing
+        return (self._input_a_value, self._input_b_value, self.get_accumulation(), self.get_output())
+
+    def set_registers(self, input_a : Bits, input_b : Bits, acc : Bits, output : Bits) -> None:
+        self.input_a(input_a)
+        self.input_b(input_b)
+        self._acc_value = BitArray(acc)
+        self._output_value = Bits(output)
+
+
+# Lane Helpers Shared by the NumPy Backends
+def _lane_dtype(lane_width : int):
+    # Lanes Wider than 64 Bits Fall Back to Python Integers
+    return np.int64 if lane_width <= 64 else object
+
+def _wrap_lanes(values : np.ndarray, lane_width : int) -> np.ndarray:
+    # Two's Complement Wraparound of Every Lane to lane_width Bits
+    if values.dtype == object:
+        half = 1 << (lane_width - 1)
+        return ((values + half) & ((1 << lane_width) - 1)) - half
+    shift = 64 - lane_width
+    return (values.view(np.uint64) << np.uint64(shift)).view(np.int64) >> np.int64(shift)
+
+def _split_lanes(value : int, total_width : int, lane_width : int) -> np.ndarray:
+    # Splitting an Unsigned Word into Signed Lanes, MSB Lane First
+    count = total_width // lane_width
+    mask = (1 << lane_width) - 1
+    if total_width <= 64:
+        shifts = np.arange(count - 1, -1, -1, dtype=np.uint64) * np.uint64(lane_width)
+        raw = (np.uint64(value) >> shifts) & np.uint64(mask)
+    else:
+        raw = np.array(
+            [(value >> (i * lane_width)) & mask for i in reversed(range(count))],
+            dtype=(np.uint64 if lane_width <= 64 else object)
+        )
+    if raw.dtype == np.uint64:
+        raw = raw.view(np.int64)
+    return _wrap_lanes(raw, lane_width)
+
+def _join_lanes(lanes : np.ndarray, lane_width : int) -> int:
+    # Packing Signed Lanes (MSB Lane First) Back into an Unsigned Word
+    mask = (1 << lane_width) - 1
+    value = 0
+    for lane in lanes.tolist():
+        value = (value << lane_width) | (lane & mask)
+    return value
+
+
+class NumpyProcessingElement(ProcessingElement):
+
+    # Drop-in Replacement for ProcessingElement that Keeps the Accumulator as a
+    # Vector of Signed Lanes, so each Instruction is a Handful of Array Operations
+    # Instead of a Per-Lane Loop over Bitstrings.
+
+    def __init__(
+        self,
+        config : ProcessingElementConfiguration,
+        default_value = 0
+    ):
+        super().__init__(config, default_value)
+
+        # Accumulator Lanes and the Width they are Currently Split At
+        self._acc_lane_width = self._config.ACCUMULATION_BITWIDTH
+        self._acc_lanes = _split_lanes(self._acc_value.uint, self._acc_lane_width, self._acc_lane_width)
+
+        # Input Lanes are Split Lazily, Once per Mode
+        self._input_a_lanes = {}
+        self._input_b_lanes = {}
+
+    def input_a(self, value : Bits) -> None:
+        self._input_a_value = value
+        self._input_a_lanes = {}
+
+    def input_a_lane(self, bus : Bits, index : int) -> None:
+        super().input_a_lane(bus, index)
+        self._input_a_lanes = {}
+
+    def input_b(self, value : Bits) -> None:
+        self._input_b_value = value
+        self._input_b_lanes = {}
+
+    def _input_lanes(self, value : Bits, cache : dict, mode : int) -> np.ndarray:
+        lanes = cache.get(mode)
+        if lanes is None:
+            lanes = _split_lanes(value.uint, self._config.INPUT_BITWIDTH, mode)
+            cache[mode] = lanes
+        return lanes
+
+    def _acc_lanes_for(self, mode : int) -> np.ndarray:
+        # Re-Splitting the Accumulator Only if the Lane Width Changed
+        num_channels = self._config.INPUT_BITWIDTH // mode
+        vacc_width = self._config.ACCUMULATION_BITWIDTH // num_channels
+        if vacc_width != self._acc_lane_width:
+            raw = _join_lanes(self._acc_lanes, self._acc_lane_width)
+            self._acc_lanes = _split_lanes(raw, self._config.ACCUMULATION_BITWIDTH, vacc_width)
+            self._acc_lane_width = vacc_width
+        return self._acc_lanes
+
+    def _handle_mac(self, mode : int):
+        acc = self._acc_lanes_for(mode)
+        a = self._input_lanes(self._input_a_value, self._input_a_lanes, mode)
+        b = self._input_lanes(self._input_b_value, self._input_b_lanes, mode)
+        self._acc_lanes = _wrap_lanes(acc + a * b, self._acc_lane_width)
+        return None
+
+    def _handle_out(self, mode : int):
+        acc = self._acc_lanes_for(mode)
+
+        # Keeping the Low mode Bits of Each Lane, then Keeping the LSBs (or Zero
+        # Padding) to Fit the Output Width
+        result = _join_lanes(acc & ((1 << mode) - 1), mode)
+        out_width = self._config.OUTPUT_BITWIDTH
+        self._output_value = Bits(uint=(result & ((1 << out_width) - 1)), length=out_width)
+        return None
+
+    def _handle_pass(self, mode : int):
+        self._acc_lanes_for(mode)
+        a = self._input_lanes(self._input_a_value, self._input_a_lanes, mode)
+        self._acc_lanes = a.astype(_lane_dtype(self._acc_lane_width))
+        return None
+
+    def _handle_clr(self):
+        self._acc_lanes = np.zeros_like(self._acc_lanes)
+        self._output_value = Bits(uint=0, length=self._config.OUTPUT_BITWIDTH)
+        return None
+
+    def _handle_rnd(self, mode : int, shift_val : int):
+        self._acc_lanes = self._acc_lanes_for(mode) >> shift_val
+        return None
+
+    def get_accumulation(self) -> Bits:
+        return Bits(uint=_join_lanes(self._acc_lanes, self._acc_lane_width), length=self._config.ACCUMULATION_BITWIDTH)
+
+    def set_registers(self, input_a : Bits, input_b : Bits, acc : Bits, output : Bits) -> None:
+        super().set_registers(input_a, input_b, acc, output)
+        self._acc_lane_width = self._config.ACCUMULATION_BITWIDTH
+        self._acc_lanes = _split_lanes(acc.uint, self._acc_lane_width, self._acc_lane_width)
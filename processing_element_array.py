@@ -0,0 +1,208 @@
+from bitstring import Bits
+from .instruction import ProcessingElementInstruction, PEI
+from .processing_element import ProcessingElementConfiguration, _lane_dtype, _wrap_lanes, _split_lanes, _join_lanes
+import numpy as np
+
+# Big-Endian Signed/Unsigned Dtypes for Byte-Aligned Lanes
+_SIGNED_LANE_DTYPES   = {8 : ">i1", 16 : ">i2", 32 : ">i4", 64 : ">i8"}
+_UNSIGNED_LANE_DTYPES = {8 : ">u1", 16 : ">u2", 32 : ">u4", 64 : ">u8"}
+
+def _split_bus(data : bytes, rows : int, lane_width : int) -> np.ndarray:
+    # Splitting a Byte-Aligned Bus into a (rows x lanes) Array of Signed Lanes
+    lanes = np.frombuffer(data, dtype=_SIGNED_LANE_DTYPES[lane_width])
+    return lanes.astype(np.int64).reshape(rows, -1)
+
+
+class ProcessingElementArray:
+
+    # Models PE_COUNT Processing Elements that Share One Instruction Stream.
+    # Accumulators are Held as One (PE x lane) Array so Every Instruction is
+    # Applied to the Whole Array in a Single Vectorized Step.
+
+    def __init__(
+        self,
+        config   : ProcessingElementConfiguration,
+        pe_count : int,
+        default_value = 0
+    ):
+
+        # Saving Inputs
+        self._config   = config
+        self._pe_count = pe_count
+
+        # The Bus Splitting/Joining Works on Whole Bytes
+        if (config.INPUT_BITWIDTH % 8) or (config.OUTPUT_BITWIDTH % 8):
+            raise ValueError(f"Vectorized PE array requires byte-aligned input/output bitwidths, got {config.INPUT_BITWIDTH}/{config.OUTPUT_BITWIDTH}.")
+
+        # Accumulators Start as One Lane per PE
+        self._acc_lane_width = config.ACCUMULATION_BITWIDTH
+        acc_row = _split_lanes(Bits(int=default_value, length=config.ACCUMULATION_BITWIDTH).uint, self._acc_lane_width, self._acc_lane_width)
+        self._acc_lanes = np.tile(acc_row, (pe_count, 1))
+
+        # Outputs Held as Big-Endian Bytes, One Row per PE
+        out_row = np.frombuffer(Bits(int=default_value, length=config.OUTPUT_BITWIDTH).tobytes(), dtype=np.uint8)
+        self._output_bytes = np.tile(out_row, (pe_count, 1))
+
+        # Input Buses, Split Lazily Once per Mode
+        self._input_a_bytes = Bits(int=default_value, length=config.INPUT_BITWIDTH * pe_count).tobytes()
+        self._input_b_value = Bits(int=default_value, length=config.INPUT_BITWIDTH).uint
+        self._input_a_lanes = {}
+        self._input_b_lanes = {}
+
+    def __len__(self) -> int:
+        return self._pe_count
+
+    def input_a_bus(self, value : Bits) -> None:
+        # MEM0 Word, PE 0 Reads the Most Significant Slice
+        self._input_a_bytes = value.tobytes()
+        self._input_a_lanes = {}
+
+    def input_a_row(self, row : np.ndarray) -> None:
+        # Packed MEM0 Row (Big-Endian uint8), Kept as a View and Split Lazily
+        self._input_a_bytes = row
+        self._input_a_lanes = {}
+
+    def input_b(self, value : Bits) -> None:
+        # MEM1 Word, Broadcast to Every PE
+        self.input_b_word(value.uint)
+
+    def input_b_word(self, value : int) -> None:
+        # Unsigned MEM1 Word, Without Building Bits
+        self._input_b_value = value
+        self._input_b_lanes = {}
+
+    def _a_lanes(self, mode : int) -> np.ndarray:
+        lanes = self._input_a_lanes.get(mode)
+        if lanes is None:
+            lanes = _split_bus(self._input_a_bytes, self._pe_count, mode)
+            self._input_a_lanes[mode] = lanes
+        return lanes
+
+    def _b_lanes(self, mode : int) -> np.ndarray:
+        lanes = self._input_b_lanes.get(mode)
+        if lanes is None:
+            lanes = _split_lanes(self._input_b_value, self._config.INPUT_BITWIDTH, mode)
+            self._input_b_lanes[mode] = lanes
+        return lanes
+
+    def _acc_lanes_for(self, mode : int) -> np.ndarray:
+        # Re-Splitting Every Accumulator Only if the Lane Width Changed
+        num_channels = self._config.INPUT_BITWIDTH // mode
+        vacc_width = self._config.ACCUMULATION_BITWIDTH // num_channels
+        if vacc_width != self._acc_lane_width:
+            rows = [
+                _split_lanes(_join_lanes(row, self._acc_lane_width), self._config.ACCUMULATION_BITWIDTH, vacc_width)
+                for row in self._acc_lanes
+            ]
+            self._acc_lanes = np.stack(rows)
+            self._acc_lane_width = vacc_width
+        return self._acc_lanes
+
+    def execute_instruction(self, instruction : ProcessingElementInstruction) -> None:
+        opcode = instruction.get_opcode().uint
+        value = instruction.get_value().uint
+        self.execute(opcode, instruction.get_mode_bitwidth(), value)
+        return None
+
+    def execute(self, opcode : int, mode : int, value : int) -> None:
+        # Same Dispatch as ProcessingElement.execute_instruction on Decoded Fields
+        if opcode == PEI.NO_VALUE:
+            if value == PEI.MAC:
+                self._handle_mac(mode)
+            elif value == PEI.NOP:
+                pass
+            elif value == PEI.OUT:
+                self._handle_out(mode)
+            elif value == PEI.PASS:
+                self._handle_pass(mode)
+            elif value == PEI.CLR:
+                self._handle_clr()
+        else:
+            self._handle_rnd(mode, value)
+        return None
+
+    def _handle_mac(self, mode : int) -> None:
+        acc = self._acc_lanes_for(mode)
+        self._acc_lanes = _wrap_lanes(acc + self._a_lanes(mode) * self._b_lanes(mode), self._acc_lane_width)
+
+    def _handle_out(self, mode : int) -> None:
+        acc = self._acc_lanes_for(mode)
+
+        # Low mode Bits of Every Lane, MSB Lane First, as Big-Endian Bytes
+        pieces = (acc & ((1 << mode) - 1)).astype(np.uint64).astype(_UNSIGNED_LANE_DTYPES[mode])
+        result = pieces.view(np.uint8).reshape(self._pe_count, -1)
+
+        # Keeping the LSB Bytes if Longer, Left Padding with Zeros if Shorter
+        out_bytes = self._config.OUTPUT_BITWIDTH // 8
+        if result.shape[1] >= out_bytes:
+            self._output_bytes = result[:, result.shape[1] - out_bytes:].copy()
+        else:
+            padded = np.zeros((self._pe_count, out_bytes), dtype=np.uint8)
+            padded[:, out_bytes - result.shape[1]:] = result
+            self._output_bytes = padded
+
+    def _handle_pass(self, mode : int) -> None:
+        self._acc_lanes_for(mode)
+        self._acc_lanes = self._a_lanes(mode).astype(_lane_dtype(self._acc_lane_width))
+
+    def _handle_clr(self) -> None:
+        self._acc_lanes = np.zeros_like(self._acc_lanes)
+        self._output_bytes = np.zeros_like(self._output_bytes)
+
+    def _handle_rnd(self, mode : int, shift_val : int) -> None:
+        self._acc_lanes = self._acc_lanes_for(mode) >> shift_val
+
+    def mac_run(self, mode : int, a_rows : np.ndarray, b_words : np.ndarray) -> None:
+        # Equivalent to len(a_rows) Cycles of Loading Inputs then MAC. Wrapping
+        # is Modular, so Summing the Products First and Wrapping Once Matches
+        # Wrapping After Every Cycle.
+        acc = self._acc_lanes_for(mode)
+        steps = a_rows.shape[0]
+        a = np.frombuffer(np.ascontiguousarray(a_rows).tobytes(), dtype=_SIGNED_LANE_DTYPES[mode]).astype(np.int64).reshape(steps, self._pe_count, -1)
+
+        # Splitting Each MEM1 Word into Signed Lanes, MSB Lane First
+        lanes = self._config.INPUT_BITWIDTH // mode
+        shifts = (np.arange(lanes - 1, -1, -1, dtype=np.uint64) * np.uint64(mode))
+        b = _wrap_lanes(((b_words[:, None] >> shifts) & np.uint64((1 << mode) - 1)).view(np.int64), mode)
+
+        if acc.dtype == object:
+            total = (a.astype(object) * b[:, None, :].astype(object)).sum(axis=0)
+        else:
+            total = np.einsum("npl,nl->pl", a, b)
+        self._acc_lanes = _wrap_lanes(acc + total, self._acc_lane_width)
+
+        # Inputs Hold the Last Cycle's Values
+        self._input_a_bytes = np.ascontiguousarray(a_rows[-1]).tobytes()
+        self._input_a_lanes = {mode : a[-1]}
+        self._input_b_value = int(b_words[-1])
+        self._input_b_lanes = {mode : b[-1]}
+        return None
+
+    def get_registers(self, index : int) -> tuple:
+        # (input a, input b, accumulation, output) of One PE, for Checkpointing
+        in_bytes = self._config.INPUT_BITWIDTH // 8
+        input_a = Bits(bytes=bytes(self._input_a_bytes[index * in_bytes : (index + 1) * in_bytes]))
+        input_b = Bits(uint=self._input_b_value, length=self._config.INPUT_BITWIDTH)
+        return (input_a, input_b, self.get_accumulation(index), self.get_output(index))
+
+    def set_registers(self, input_a : list[Bits], input_b : Bits, acc : list[Bits], output : list[Bits]) -> None:
+        # Restoring Every PE; input_b is the Shared Broadcast Word
+        self.input_a_bus(Bits().join(input_a))
+        self.input_b(input_b)
+        self._acc_lane_width = self._config.ACCUMULATION_BITWIDTH
+        self._acc_lanes = np.stack([_split_lanes(value.uint, self._acc_lane_width, self._acc_lane_width) for value in acc])
+        self._output_bytes = np.stack([np.frombuffer(value.tobytes(), dtype=np.uint8) for value in output])
+
+    def get_output_bus(self) -> Bits:
+        # All PE Outputs Joined, PE 0 in the Most Significant Slice
+        return Bits(bytes=self._output_bytes.tobytes())
+
+    def get_output_row(self) -> np.ndarray:
+        # All PE Outputs as One Packed Row, the Layout MEM2 Stores
+        return self._output_bytes.reshape(-1)
+
+    def get_output(self, index : int) -> Bits:
+        return Bits(bytes=self._output_bytes[index].tobytes())
+
+    def get_accumulation(self, index : int) -> Bits:
+        return Bits(uint=_join_lanes(self._acc_lanes[index], self._acc_lane_width), length=self._config.ACCUMULATION_BITWIDTH)
@@ -0,0 +1,120 @@
+from .instruction import MI, PEI
+import time
+
+# Opt-In Instrumentation. A Profiler Wraps Methods on the Instances it is
+# Attached To (Never the Classes), so Unprofiled Accelerators Run Untouched.
+
+_PE_OP_NAMES  = {PEI.MAC : "MAC", PEI.NOP : "NOP", PEI.OUT : "OUT", PEI.PASS : "PASS", PEI.CLR : "CLR"}
+_MEM_OP_NAMES = {MI.READ : "READ", MI.WRITE : "WRITE"}
+
+# Handlers Timed on Each Component
+_BUFFER_HANDLERS = ["_read", "_write", "read_run"]
+_PE_HANDLERS     = ["_handle_mac", "_handle_out", "_handle_pass", "_handle_clr", "_handle_rnd", "mac_run"]
+_ACCEL_HANDLERS  = ["_join_pe_outputs", "_load_pe_inputs"]
+
+
+def pe_op_name(opcode : int, value : int) -> str:
+    if opcode != PEI.NO_VALUE:
+        return "RND"
+    return _PE_OP_NAMES.get(value, "NOP")
+
+def mem_op_name(opcode : int) -> str:
+    return _MEM_OP_NAMES.get(opcode, "NOP")
+
+
+class Profiler:
+
+    def __init__(self):
+        self._attached = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.cycles         = 0
+        self.instructions   = 0
+        self.pe_cycles      = {}
+        self.mem_cycles     = {}
+        self.handler_time   = {}
+        self.handler_calls  = {}
+        self.lane_macs      = 0
+        self._pe_count      = 0
+        self._input_width   = 0
+
+    def attach(self, accelerator) -> "Profiler":
+        config = accelerator._controller_config
+        self._pe_count = config.PE_COUNT
+        self._input_width = config.PE_CONFIG.INPUT_BITWIDTH
+
+        # Counting Cycles per Decoded Instruction
+        self._wrap(accelerator, "execute_decoded_instruction", self._counting(accelerator.execute_decoded_instruction))
+
+        # Timing Handlers on the Accelerator, Buffer and Every PE Object
+        for name in _ACCEL_HANDLERS:
+            self._wrap_timed(accelerator, name, f"accelerator.{name.lstrip('_')}")
+        for name in _BUFFER_HANDLERS:
+            self._wrap_timed(accelerator._main_buffer, name, f"buffer.{name.lstrip('_')}")
+        pes = [accelerator._pe_array] if accelerator._vectorized else accelerator._pe_array
+        for pe in pes:
+            for name in _PE_HANDLERS:
+                self._wrap_timed(pe, name, f"pe.{name.replace('_handle_', '')}")
+        return self
+
+    def detach(self) -> None:
+        # Removing the Instance Wrappers so Class Methods Apply Again
+        for owner, name in self._attached:
+            del owner.__dict__[name]
+        self._attached = []
+
+    def _wrap(self, owner, name : str, wrapper) -> None:
+        setattr(owner, name, wrapper)
+        self._attached.append((owner, name))
+
+    def _wrap_timed(self, owner, name : str, label : str) -> None:
+        method = getattr(owner, name, None)
+        if method is None:
+            return
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.handler_time[label] = self.handler_time.get(label, 0.0) + (time.perf_counter() - start)
+            self.handler_calls[label] = self.handler_calls.get(label, 0) + 1
+            return result
+
+        self._wrap(owner, name, timed)
+
+    def _counting(self, method):
+        def counting(decoded):
+            cycles = decoded.count + 1
+            pe_op = pe_op_name(decoded.pe_opcode, decoded.pe_value)
+            mem_op = mem_op_name(decoded.mem_opcode)
+            self.cycles += cycles
+            self.instructions += 1
+            self.pe_cycles[pe_op] = self.pe_cycles.get(pe_op, 0) + cycles
+            self.mem_cycles[mem_op] = self.mem_cycles.get(mem_op, 0) + cycles
+            if pe_op == "MAC":
+                self.lane_macs += cycles * self._pe_count * (self._input_width // decoded.pe_mode)
+            return method(decoded)
+        return counting
+
+    def report(self) -> dict:
+        # Raw Counters Plus Derived Hardware Metrics
+        cycles = max(self.cycles, 1)
+        reads = self.mem_cycles.get("READ", 0)
+        return {
+            "cycles"            : self.cycles,
+            "instructions"      : self.instructions,
+            "pe_cycles"         : dict(self.pe_cycles),
+            "mem_cycles"        : dict(self.mem_cycles),
+            "handler_time"      : dict(self.handler_time),
+            "handler_calls"     : dict(self.handler_calls),
+            "mac_utilization"   : self.pe_cycles.get("MAC", 0) / cycles,
+            "lane_macs"         : self.lane_macs,
+            "mem0_reads"        : reads,
+            "mem1_reads"        : reads,
+            "mem2_writes"       : self.mem_cycles.get("WRITE", 0),
+        }
+
+    def estimate_energy(self, energy_per_event : dict) -> float:
+        # Energy from Per-Event Costs, e.g. {"lane_macs": 0.2, "mem0_reads": 5.0}
+        report = self.report()
+        return sum(cost * report.get(event, 0) for event, cost in energy_per_event.items())
@@ -0,0 +1,96 @@
+from .decoded_instruction import DecodedInstruction
+import numpy as np
+import hashlib
+import zipfile
+import os
+
+# Content-Addressed Store of Final Accelerator States. An Entry is a
+# Checkpoint Named by a Hash of the Starting State (Configuration, Memories,
+# Registers and Ports) and the Decoded Program, so Identical Runs Restore it
+# Instead of Simulating. Entries are Touched on Every Hit, and the Least
+# Recently Used are Evicted Once the Directory Exceeds max_bytes.
+
+class ResultCache:
+
+    def __init__(self, directory : str, max_bytes : int = 1 << 30):
+        if max_bytes <= 0:
+            raise ValueError(f"Cache size limit must be positive, got {max_bytes}.")
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self._directory, exist_ok=True)
+
+    def key(self, state : dict, program : list[DecodedInstruction]) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(state):
+            value = np.ascontiguousarray(state[name])
+            digest.update(f"{name}:{value.dtype.str}:{value.shape}".encode())
+            digest.update(value.tobytes())
+        digest.update(repr([decoded.astuple() for decoded in program]).encode())
+        return digest.hexdigest()
+
+    def _path(self, key : str) -> str:
+        return os.path.join(self._directory, f"{key}.npz")
+
+    def restore(self, key : str, accelerator) -> bool:
+        # The Key Covers MEM0/MEM1, so Entries Only Hold MEM2, Ports and
+        # Registers and the Accelerator Keeps its (Possibly Mapped) Images.
+        # Unreadable Entries are Deleted and Count as Misses.
+        path = self._path(key)
+        try:
+            accelerator.load_checkpoint(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+            self._remove(path)
+            self.misses += 1
+            return False
+        os.utime(path)
+        self.hits += 1
+        return True
+
+    def store(self, key : str, accelerator) -> None:
+        # Writing Through a Temporary File so Concurrent Jobs Never See a
+        # Partial Entry
+        temp = os.path.join(self._directory, f"{key}.{os.getpid()}.tmp.npz")
+        accelerator.save_checkpoint(temp, memories=False)
+        os.replace(temp, self._path(key))
+        self._evict()
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            os.remove(path)
+
+    def _entries(self) -> list[tuple]:
+        # (path, bytes, last use) of Every Finished Entry
+        entries = []
+        for name in os.listdir(self._directory):
+            if name.endswith(".npz") and not name.endswith(".tmp.npz"):
+                path = os.path.join(self._directory, name)
+                try:
+                    info = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((path, info.st_size, info.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self._max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path : str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
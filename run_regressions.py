@@ -0,0 +1,261 @@
+from src.processing_element import ProcessingElement, NumpyProcessingElement, ProcessingElementConfiguration
+from src.processing_element_array import ProcessingElementArray
+from src.main_buffer import MainBufferConfiguration
+from src.accelerator import Accelerator, AcceleratorConfiguration
+from src.decoded_instruction import DecodedInstruction, InstructionLayout
+from src.optimizer import optimize_program, check_equivalence
+from src.instruction import MI, PEI, ProcessingElementInstructionConfiguration, MemoryInstructionConfiguration, InstConfig
+from concurrent.futures import ProcessPoolExecutor
+from bitstring import Bits
+import numpy as np
+import contextlib
+import importlib
+import argparse
+import random
+import time
+import sys
+import io
+import os
+
+# Runs Every test_* Function from the test_*.py Scripts Next to this File,
+# Plus Seeded Random Programs Checking the Fast Backends Against the Bitstring
+# Reference, in Parallel. Exits with the Number of Failures.
+
+MODES = [8, 16, 32]
+PE_OPS = ["MAC", "MAC", "MAC", "OUT", "PASS", "CLR", "NOP", "RND"]
+
+
+def discover_tests() -> list[tuple]:
+    # (module, function) Pairs for Every test_* Function in test_*.py
+    here = os.path.dirname(os.path.abspath(__file__))
+    jobs = []
+    for name in sorted(os.listdir(here)):
+        if name.startswith("test_") and name.endswith(".py"):
+            module = importlib.import_module(f"src.{name[:-3]}")
+            jobs += [(module.__name__, attr) for attr in dir(module) if attr.startswith("test_") and callable(getattr(module, attr))]
+    return jobs
+
+def run_test(module_name : str, test_name : str) -> tuple:
+    # Test Functions Print their Status and Return the Number of Failures
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            errors = getattr(importlib.import_module(module_name), test_name)()
+    except Exception as error:
+        errors = 1
+        log.write(f"{type(error).__name__}: {error}\n")
+    return (f"{module_name}.{test_name}", None, errors, time.perf_counter() - start, log.getvalue().strip())
+
+
+def random_pe_config(rng : random.Random) -> ProcessingElementConfiguration:
+    return ProcessingElementConfiguration(
+        INPUT_BITWIDTH        = 32,
+        ACCUMULATION_BITWIDTH = rng.choice([32, 64, 128]),
+        OUTPUT_BITWIDTH       = rng.choice([16, 32, 64])
+    )
+
+def random_pe_step(rng : random.Random) -> tuple:
+    op = rng.choice(PE_OPS)
+    mode = rng.choice(MODES)
+    if op == "RND":
+        return (PEI.RND, mode, rng.randrange(16))
+    return (PEI.NO_VALUE, mode, getattr(PEI, op))
+
+def scenario_pe_backends(seed : int) -> tuple:
+    # Scalar, NumPy and Array PEs Must Agree on Every Output and Accumulation
+    rng = random.Random(seed)
+    config = random_pe_config(rng)
+    pe_count = rng.choice([1, 2, 4])
+    reference = [ProcessingElement(config) for _ in range(pe_count)]
+    numpy_pes = [NumpyProcessingElement(config) for _ in range(pe_count)]
+    pe_array = ProcessingElementArray(config, pe_count)
+
+    for step in range(200):
+        if rng.random() < 0.5:
+            a_bus = Bits(uint=rng.getrandbits(32 * pe_count), length=32 * pe_count)
+            b_value = Bits(uint=rng.getrandbits(32), length=32)
+            pe_array.input_a_bus(a_bus)
+            pe_array.input_b(b_value)
+            for i in range(pe_count):
+                for pe in (reference[i], numpy_pes[i]):
+                    pe.input_a(a_bus[i * 32 : (i + 1) * 32])
+                    pe.input_b(b_value)
+
+        opcode, mode, value = random_pe_step(rng)
+        pe_array.execute(opcode, mode, value)
+        for i in range(pe_count):
+            reference[i].execute(opcode, mode, value)
+            numpy_pes[i].execute(opcode, mode, value)
+            expected = (reference[i].get_output(), reference[i].get_accumulation())
+            if (numpy_pes[i].get_output(), numpy_pes[i].get_accumulation()) != expected:
+                return (1, f"NumPy PE {i} diverged at step {step} with {config}")
+            if (pe_array.get_output(i), pe_array.get_accumulation(i)) != expected:
+                return (1, f"PE array lane {i} diverged at step {step} with {config}")
+    return (0, f"{config}, {pe_count} PEs")
+
+def random_accelerator(rng : random.Random, depth : int = 32) -> tuple:
+    # (Configuration, MEM0 Words, MEM1 Words) with Roughly Half the MEM0 Words Zero
+    pe_config = random_pe_config(rng)
+    pe_count = rng.choice([2, 4, 8])
+    config = AcceleratorConfiguration(
+        COUNTER_BITWIDTH = 10,
+        PE_COUNT         = pe_count,
+        PE_CONFIG        = pe_config,
+        BUFFER_CONFIG    = MainBufferConfiguration(
+            MEM0_BITWIDTH = pe_count * pe_config.INPUT_BITWIDTH,  MEM0_DEPTH = depth,
+            MEM1_BITWIDTH = pe_config.INPUT_BITWIDTH,             MEM1_DEPTH = depth,
+            MEM2_BITWIDTH = pe_count * pe_config.OUTPUT_BITWIDTH, MEM2_DEPTH = depth
+        )
+    )
+    mem0 = [Bits(uint=rng.getrandbits(pe_count * 32) * rng.randrange(2), length=pe_count * 32) for _ in range(depth)]
+    mem1 = [Bits(uint=rng.getrandbits(32), length=32) for _ in range(depth)]
+    return config, mem0, mem1
+
+def random_program(rng : random.Random, depth : int = 32, length : int = 60) -> list[DecodedInstruction]:
+    program = []
+    for _ in range(length):
+        opcode, mode, value = random_pe_step(rng)
+        mem_opcode = rng.choice([MI.READ, MI.READ, MI.WRITE, MI.NOP])
+        count = rng.choice([0, 0, 1, 7, 15])
+        mema_inc, memb_inc = rng.randrange(2), rng.randrange(2)
+        mema_offset = rng.randrange(depth - count * mema_inc)
+        memb_offset = rng.randrange(depth - count * memb_inc)
+        program.append(DecodedInstruction(mem_opcode, mode, mema_offset, memb_offset, opcode, mode, value, count, mema_inc, memb_inc))
+    return program
+
+def scenario_accelerator_backends(seed : int) -> tuple:
+    # Per-PE, Vectorized and Sparse Accelerators Must Write Identical MEM2 Images
+    rng = random.Random(seed)
+    config, mem0, mem1 = random_accelerator(rng)
+    program = random_program(rng)
+    images = []
+    for vectorized, sparse in ((False, False), (True, False), (True, True)):
+        accelerator = Accelerator(config, vectorized=vectorized)
+        if sparse:
+            accelerator.enable_sparse()
+        accelerator.set_memory(list(mem0), list(mem1))
+        for decoded in program:
+            accelerator.execute_decoded_instruction(decoded)
+        images.append(accelerator.get_mem2())
+    if any(image != images[0] for image in images[1:]):
+        return (1, f"MEM2 diverged with {config.PE_COUNT} PEs and {config.PE_CONFIG}")
+    return (0, f"{config.PE_CONFIG}, {config.PE_COUNT} PEs")
+
+def scenario_kernel(seed : int) -> tuple:
+    # Compiled Kernels Must Leave the Same Complete State as the Interpreter
+    rng = random.Random(seed)
+    config, mem0, mem1 = random_accelerator(rng)
+    program = random_program(rng)
+    for vectorized in (False, True):
+        states = []
+        for compiled in (False, True):
+            accelerator = Accelerator(config, vectorized=vectorized)
+            accelerator.set_memory(list(mem0), list(mem1))
+            if compiled:
+                accelerator.run_kernel(accelerator.compile_kernel(program))
+            else:
+                for decoded in program:
+                    accelerator.execute_decoded_instruction(decoded)
+            states.append(accelerator._checkpoint_state())
+        if any(not np.array_equal(states[0][name], states[1][name]) for name in states[0]):
+            return (1, f"Kernel diverged on the {'vectorized' if vectorized else 'per-PE'} backend with {config.PE_COUNT} PEs and {config.PE_CONFIG}")
+    return (0, f"{config.PE_CONFIG}, {config.PE_COUNT} PEs")
+
+def scenario_optimizer(seed : int) -> tuple:
+    # Optimized Programs Must Encode in the Instruction Layout, Never Take
+    # More Cycles and Leave the Same Complete State on Both Backends. The
+    # 4 Bit count Field is Narrow Enough that Merges Hit its Bound.
+    rng = random.Random(seed)
+    config, _, _ = random_accelerator(rng)
+    inst_config = InstConfig(
+        COUNT_BITWIDTH     = 4,
+        MEMA_INC_BITWIDTH  = 1,
+        MEMB_INC_BITWIDTH  = 1,
+        MEMORY_INST_CONFIG = MemoryInstructionConfiguration(OPCODE_BITWIDTH=2, MODE_BITWIDTH=2, MEMA_OFFSET_BITWIDTH=5, MEMB_OFFSET_BITWIDTH=5),
+        PE_INST_CONFIG     = ProcessingElementInstructionConfiguration(OPCODE_BITWIDTH=2, MODE_BITWIDTH=2, VALUE_BITWIDTH=5)
+    )
+
+    # Random Instructions Padded with the Redundancy Compilers Emit: NOPs,
+    # Repeated CLRs and OUTs, and Repeats of Fixed-Address Instructions
+    program = []
+    for decoded in random_program(rng, length=40):
+        program.append(decoded)
+        mode = decoded.pe_mode
+        extra = rng.choice(["none", "none", "nop", "clr", "out", "repeat"])
+        if extra == "nop":
+            program.append(DecodedInstruction(MI.NOP, mode, 0, 0, PEI.NO_VALUE, mode, PEI.NOP, rng.randrange(4)))
+        elif extra in ("clr", "out"):
+            value = PEI.CLR if extra == "clr" else PEI.OUT
+            program += [DecodedInstruction(MI.NOP, mode, 0, 0, PEI.NO_VALUE, mode, value)] * 2
+        elif extra == "repeat" and decoded.mema_inc == 0 and decoded.memb_inc == 0:
+            program.append(decoded)
+
+    optimized, report = optimize_program(program, inst_config)
+    layout = InstructionLayout(inst_config)
+    for decoded in optimized:
+        layout.encode(decoded)
+    if report.cycles_after > report.cycles_before:
+        return (1, f"Optimizing took {report.cycles_before} cycles to {report.cycles_after}")
+    for vectorized in (False, True):
+        if not check_equivalence(config, program, optimized, seed=seed, vectorized=vectorized):
+            return (1, f"Optimized program diverged on the {'vectorized' if vectorized else 'per-PE'} backend with {config.PE_COUNT} PEs and {config.PE_CONFIG}")
+    return (0, f"{report.instructions_before} -> {report.instructions_after} instructions, {report.cycles_saved} cycles saved")
+
+SCENARIOS = {
+    "pe_backends"          : scenario_pe_backends,
+    "accelerator_backends" : scenario_accelerator_backends,
+    "kernel"               : scenario_kernel,
+    "optimizer"            : scenario_optimizer,
+}
+
+def run_scenario(name : str, seed : int) -> tuple:
+    start = time.perf_counter()
+    try:
+        errors, detail = SCENARIOS[name](seed)
+    except Exception as error:
+        errors, detail = 1, f"{type(error).__name__}: {error}"
+    return (f"scenario.{name}", seed, errors, time.perf_counter() - start, detail)
+
+
+def main():
+
+    # Parsing Arguments
+    parser = argparse.ArgumentParser(description="Parallel regression runner.")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seeds", type=int, default=8, help="random scenarios per kind")
+    parser.add_argument("--base-seed", type=int, default=0, help="first scenario seed")
+    parser.add_argument("--no-tests", action="store_true", help="only run random scenarios")
+    args = parser.parse_args()
+
+    # Building the Job List
+    jobs = [] if args.no_tests else [(run_test, module, test) for module, test in discover_tests()]
+    jobs += [(run_scenario, name, seed) for name in SCENARIOS for seed in range(args.base_seed, args.base_seed + args.seeds)]
+
+    # Running Everything Across the Pool
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(*job) for job in jobs]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    # Reporting Per-Test Timing and the Seeds Used
+    errors = 0
+    for name, seed, failed, duration, detail in results:
+        status = "FAIL" if failed else "PASS"
+        label = name if seed is None else f"{name}[seed={seed}]"
+        print(f"{status} {duration:8.3f}s {label}")
+        if failed:
+            print(f"    {detail}")
+        errors += failed
+
+    print(f"Seeds {args.base_seed}..{args.base_seed + args.seeds - 1} per scenario, {len(results)} jobs in {elapsed:.2f}s.")
+    if errors == 0:
+        print("All Tests Passed!")
+    else:
+        print(f"{errors} Tests Failed!")
+    sys.exit(errors)
+
+
+if __name__ == "__main__":
+    main()
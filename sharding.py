@@ -0,0 +1,67 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from .accelerator import Accelerator, AcceleratorConfiguration
+from .decoded_instruction import DecodedInstruction, InstructionDecoder
+import numpy as np
+import os
+
+# PEs Only Read their Own MEM0 Slice (Plus the Broadcast MEM1 Word) and Only
+# Write their Own MEM2 Slice, so the Array Splits into Independent Column
+# Groups that Replay the Same Instruction Stream in Separate Processes.
+
+def shard_config(config : AcceleratorConfiguration, pe_count : int) -> AcceleratorConfiguration:
+    # Same Accelerator with Only pe_count PEs and Matching MEM0/MEM2 Widths
+    buffer_config = replace(
+        config.BUFFER_CONFIG,
+        MEM0_BITWIDTH = pe_count * config.PE_CONFIG.INPUT_BITWIDTH,
+        MEM2_BITWIDTH = pe_count * config.PE_CONFIG.OUTPUT_BITWIDTH
+    )
+    return replace(config, PE_COUNT=pe_count, BUFFER_CONFIG=buffer_config)
+
+def _run_shard(config : AcceleratorConfiguration, mem0 : np.ndarray, mem1 : np.ndarray, program : list[DecodedInstruction]) -> np.ndarray:
+    accelerator = Accelerator(config, vectorized=True)
+    accelerator.set_mem0_array(mem0)
+    accelerator.set_mem1_array(mem1)
+    for decoded in program:
+        accelerator.execute_decoded_instruction(decoded)
+    return accelerator.get_mem2_array()
+
+def simulate_sharded(
+    config      : AcceleratorConfiguration,
+    mem0        : np.ndarray,
+    mem1        : np.ndarray,
+    program     : list,
+    shards      : int = None,
+    max_workers : int = None
+) -> np.ndarray:
+    # Runs a Program from Reset on Packed MEM0/MEM1 Images and Returns the
+    # Packed MEM2 Image, with the PE Array Split Across Worker Processes
+    config.validate()
+    pe_config = config.PE_CONFIG
+    if (pe_config.INPUT_BITWIDTH % 8) or (pe_config.OUTPUT_BITWIDTH % 8):
+        raise ValueError(f"Sharding requires byte-aligned input/output bitwidths, got {pe_config.INPUT_BITWIDTH}/{pe_config.OUTPUT_BITWIDTH}.")
+
+    # Decoding Once in the Parent so Workers Receive Plain-Int Records
+    if program and not isinstance(program[0], DecodedInstruction):
+        program = InstructionDecoder().decode_program(program)
+
+    # Splitting the PEs into Contiguous Groups, PE 0 in the First
+    shards = min(shards or os.cpu_count() or 1, config.PE_COUNT)
+    groups = [group for group in np.array_split(np.arange(config.PE_COUNT), shards) if len(group)]
+    in_bytes = pe_config.INPUT_BITWIDTH // 8
+
+    mem0 = np.asarray(mem0)
+    mem1 = np.asarray(mem1)
+    jobs = [
+        (shard_config(config, len(group)), np.ascontiguousarray(mem0[:, group[0] * in_bytes : (group[-1] + 1) * in_bytes]), mem1, program)
+        for group in groups
+    ]
+
+    if len(jobs) == 1:
+        results = [_run_shard(*jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=(max_workers or len(jobs))) as pool:
+            results = list(pool.map(_run_shard, *zip(*jobs)))
+
+    # MEM2 Slices Concatenate Back in PE Order
+    return np.concatenate(results, axis=1)
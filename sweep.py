@@ -0,0 +1,175 @@
+from src.processing_element import ProcessingElementConfiguration
+from src.main_buffer import MainBufferConfiguration
+from src.accelerator import Accelerator, AcceleratorConfiguration
+from src.matvec import plan_matvec, wrap_to_mode
+from src.benchmarks import WORKLOADS
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+import numpy as np
+import itertools
+import argparse
+import hashlib
+import json
+import time
+import sys
+import os
+
+# Design-Space Exploration. Enumerates AcceleratorConfiguration Points,
+# Prunes Those that Fail Validation or Cannot Run a Workload, Runs the
+# Reference Matvec Workloads on the Rest in Parallel and Writes a Table of
+# Throughput, Cycles and Storage. Results are Cached by Configuration Hash,
+# so Rerunning a Sweep Only Simulates New Points.
+
+CACHE_VERSION = 1
+COLUMNS = ["key", "workload", "pe_count", "input", "accumulation", "output", "depth", "cycles", "macs_per_cycle", "sim_seconds", "storage_bits", "correct"]
+
+
+def build_config(pe_count : int, input_width : int, acc_width : int, output_width : int, depth : int, counter_width : int = 10) -> AcceleratorConfiguration:
+    # MEM0/MEM2 Span the Array and MEM1 Matches One PE Input
+    return AcceleratorConfiguration(
+        COUNTER_BITWIDTH = counter_width,
+        PE_COUNT         = pe_count,
+        PE_CONFIG        = ProcessingElementConfiguration(
+            INPUT_BITWIDTH        = input_width,
+            ACCUMULATION_BITWIDTH = acc_width,
+            OUTPUT_BITWIDTH       = output_width
+        ),
+        BUFFER_CONFIG    = MainBufferConfiguration(
+            MEM0_BITWIDTH = pe_count * input_width,  MEM0_DEPTH = depth,
+            MEM1_BITWIDTH = input_width,             MEM1_DEPTH = depth,
+            MEM2_BITWIDTH = pe_count * output_width, MEM2_DEPTH = depth
+        )
+    )
+
+def config_key(config : AcceleratorConfiguration, workload : str) -> str:
+    # Stable Hash of Every Configuration Field Plus the Workload
+    payload = json.dumps([CACHE_VERSION, workload, WORKLOADS[workload], asdict(config)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+def storage_bits(config : AcceleratorConfiguration) -> int:
+    buf = config.BUFFER_CONFIG
+    pe = config.PE_CONFIG
+    memories = buf.MEM0_BITWIDTH * buf.MEM0_DEPTH + buf.MEM1_BITWIDTH * buf.MEM1_DEPTH + buf.MEM2_BITWIDTH * buf.MEM2_DEPTH
+    registers = config.PE_COUNT * (2 * pe.INPUT_BITWIDTH + pe.ACCUMULATION_BITWIDTH + pe.OUTPUT_BITWIDTH)
+    return memories + registers
+
+def check_point(config : AcceleratorConfiguration, workload : str) -> str:
+    # Reason the Point Cannot Run, or None
+    rows, cols, mode = WORKLOADS[workload]
+    pe = config.PE_CONFIG
+    try:
+        config.validate()
+        if config.PE_COUNT < 1:
+            raise ValueError(f"PE count {config.PE_COUNT} must be at least 1.")
+        if (pe.INPUT_BITWIDTH % mode) or (pe.ACCUMULATION_BITWIDTH % (pe.INPUT_BITWIDTH // mode)):
+            raise ValueError(f"Mode {mode} does not split input {pe.INPUT_BITWIDTH} / accumulation {pe.ACCUMULATION_BITWIDTH} into lanes.")
+        if (pe.INPUT_BITWIDTH % 8) or (pe.OUTPUT_BITWIDTH % 8):
+            raise ValueError("Vectorized model requires byte-aligned input/output bitwidths.")
+        plan_matvec(config, rows, cols, mode)
+    except ValueError as error:
+        return str(error)
+    return None
+
+def enumerate_points(pe_counts, input_widths, acc_widths, output_widths, depths, workloads) -> tuple:
+    # (Runnable (key, config, workload) Points, Pruned Count)
+    points, pruned = [], 0
+    for pe_count, input_width, acc_width, output_width, depth in itertools.product(pe_counts, input_widths, acc_widths, output_widths, depths):
+        config = build_config(pe_count, input_width, acc_width, output_width, depth)
+        for workload in workloads:
+            if check_point(config, workload) is None:
+                points.append((config_key(config, workload), config, workload))
+            else:
+                pruned += 1
+    return points, pruned
+
+def run_point(key : str, config : AcceleratorConfiguration, workload : str) -> dict:
+    rows, cols, mode = WORKLOADS[workload]
+    rng = np.random.default_rng(0)
+    bound = min(5, (1 << (mode - 1)) - 1)
+    matrix = rng.integers(-bound, bound + 1, (rows, cols))
+    vector = rng.integers(-bound, bound + 1, cols)
+
+    accelerator = Accelerator(config, vectorized=True)
+    cycle_model = accelerator.enable_cycle_model()
+    start = time.perf_counter()
+    result = accelerator.run_matvec(matrix, vector, mode)
+    elapsed = time.perf_counter() - start
+
+    pe = config.PE_CONFIG
+    return {
+        "key"            : key,
+        "workload"       : workload,
+        "pe_count"       : config.PE_COUNT,
+        "input"          : pe.INPUT_BITWIDTH,
+        "accumulation"   : pe.ACCUMULATION_BITWIDTH,
+        "output"         : pe.OUTPUT_BITWIDTH,
+        "depth"          : config.BUFFER_CONFIG.MEM0_DEPTH,
+        "cycles"         : cycle_model.cycles,
+        "macs_per_cycle" : rows * cols / cycle_model.cycles,
+        "sim_seconds"    : elapsed,
+        "storage_bits"   : storage_bits(config),
+        "correct"        : bool(np.array_equal(result, wrap_to_mode(matrix @ vector, mode))),
+    }
+
+def load_cache(path : str) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def save_cache(path : str, cache : dict) -> None:
+    # Writing Through a Temporary File so an Interrupted Sweep Keeps the Old Cache
+    if path:
+        with open(path + ".tmp", "w") as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+def write_table(path : str, rows : list[dict]) -> None:
+    with open(path, "w") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        for row in rows:
+            f.write(",".join(str(row[column]) for column in COLUMNS) + "\n")
+
+
+def main():
+
+    # Parsing Arguments
+    parser = argparse.ArgumentParser(description="Design-space exploration over accelerator configurations.")
+    parser.add_argument("--pe-counts", type=int, nargs="+", default=[16, 32, 64])
+    parser.add_argument("--input-widths", type=int, nargs="+", default=[32])
+    parser.add_argument("--acc-widths", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--output-widths", type=int, nargs="+", default=[32, 64])
+    parser.add_argument("--depths", type=int, nargs="+", default=[256, 1024])
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", default="sweep_cache.json", help="JSON cache of finished points ('' disables)")
+    parser.add_argument("--out", default="sweep.csv", help="CSV table to write")
+    args = parser.parse_args()
+
+    # Enumerating and Pruning Points, then Skipping Cached Ones
+    points, pruned = enumerate_points(args.pe_counts, args.input_widths, args.acc_widths, args.output_widths, args.depths, args.workloads)
+    cache = load_cache(args.cache)
+    pending = [point for point in points if point[0] not in cache]
+    print(f"{len(points)} points ({pruned} pruned), {len(points) - len(pending)} cached, {len(pending)} to run.")
+
+    # Running New Points Across the Pool, Caching as they Finish
+    start = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for row in pool.map(run_point, *zip(*pending)):
+                cache[row["key"]] = row
+                save_cache(args.cache, cache)
+    elapsed = time.perf_counter() - start
+
+    # Reporting Every Requested Point, Best Throughput First
+    rows = sorted((cache[key] for key, _, _ in points), key=lambda row: (row["workload"], -row["macs_per_cycle"], row["storage_bits"]))
+    for row in rows:
+        print(f"{row['workload']:14s} PE={row['pe_count']:<3d} in={row['input']:<3d} acc={row['accumulation']:<4d} out={row['output']:<3d} depth={row['depth']:<5d} "
+              f"cycles={row['cycles']:<9d} macs/cycle={row['macs_per_cycle']:8.2f} storage={row['storage_bits']:,} {'' if row['correct'] else 'MISMATCH'}")
+    write_table(args.out, rows)
+    print(f"Wrote {len(rows)} rows to {args.out} in {elapsed:.2f}s.")
+    sys.exit(sum(not row["correct"] for row in rows))
+
+
+if __name__ == "__main__":
+    main()
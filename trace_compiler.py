@@ -0,0 +1,167 @@
+from bitstring import Bits
+from .decoded_instruction import DecodedInstruction
+from .instruction import MI, PEI
+import numpy as np
+
+# Compiles a Decoded Program for One Configuration and Backend into a Single
+# Generated Python Function. Opcodes, Modes, Address Cursors and Loop Bounds
+# are Resolved at Compile Time, so Each Step Calls the Buffer and PE Handlers
+# Directly Instead of Going Through their Opcode Dispatch, and Data Moves
+# Between them as Packed Rows and Ints Instead of Bits. Counted READ+MAC Runs
+# and Consecutive READ+MAC Instructions in One Mode Become One Batched Gather
+# and mac_run on the Vectorized Backend, and Counted Steps that Only Repeat an
+# Idempotent PE Operation Run Once. On benchmarks.py's Kernel Workload the
+# Vectorized Backend Runs About 2.6-2.9x Faster Compiled; Per-PE Kernels are
+# Bound by Bitstring Arithmetic and Run at About Interpreter Speed.
+
+# Iterations at or Below this Count are Unrolled, Longer Ones Become Loops
+UNROLL_LIMIT = 4
+
+# Handler Aliases Bound at the Top of a Kernel, by PE Value
+_PE_HANDLERS = {PEI.MAC : "mac", PEI.OUT : "out", PEI.PASS : "pass_", PEI.CLR : "clr"}
+
+# PE Values that Leave the Same State when Repeated Without a READ
+_IDEMPOTENT = {PEI.NOP, PEI.OUT, PEI.PASS, PEI.CLR}
+
+
+class Kernel:
+
+    def __init__(self, config, program : list[DecodedInstruction], vectorized : bool, source : str):
+        self.config = config
+        self.program = program
+        self.vectorized = vectorized
+        self.source = source
+        namespace = {"Bits" : Bits, "np" : np}
+        exec(compile(source, f"<kernel of {len(program)} instructions>", "exec"), namespace)
+        self._function = namespace["kernel"]
+
+    def __call__(self, accelerator) -> None:
+        # Kernels Bypass the Per-Instruction Hooks, so Accelerators Using Them
+        # Must Execute kernel.program Instead
+        if (accelerator._controller_config != self.config) or (accelerator._vectorized != self.vectorized):
+            raise ValueError("Kernel was compiled for a different configuration or backend.")
+        hooks = [name for name, enabled in [
+            ("sparse mode",  accelerator._sparse),
+            ("profiling",    accelerator._profiler is not None),
+            ("cycle model",  accelerator._cycle_model is not None),
+        ] if enabled]
+        if hooks:
+            raise ValueError(f"Kernels cannot run with {', '.join(hooks)} enabled; execute kernel.program instead.")
+        self._function(accelerator._main_buffer, accelerator._pe_array)
+
+
+def _pe_call(decoded : DecodedInstruction) -> tuple:
+    # (Handler Alias, Arguments) for the PE Half, or None for NOP
+    if decoded.pe_opcode != PEI.NO_VALUE:
+        return ("rnd", f"{decoded.pe_mode}, {decoded.pe_value}")
+    handler = _PE_HANDLERS.get(decoded.pe_value)
+    if handler is None:
+        return None
+    return (handler, "" if handler == "clr" else f"{decoded.pe_mode}")
+
+def _iteration(decoded : DecodedInstruction, vectorized : bool, mema : str, memb : str) -> list[str]:
+    # Statements for One Iteration, in the Interpreter's Order
+    lines = []
+    if decoded.mem_opcode == MI.WRITE:
+        lines.append("write_port(out_row())" if vectorized else "write_port(join())")
+        lines.append(f"write({mema})")
+    elif decoded.mem_opcode == MI.READ:
+        lines.append(f"read({decoded.mem_mode}, {mema}, {memb})")
+        if vectorized:
+            lines.append("input_a(mem0_row())")
+            lines.append("input_b(mem1_word())")
+        else:
+            lines.append("bus, b_val = mem0_out(), mem1_out()")
+            lines.append("for i, pe in enumerate(pes): pe.input_a_lane(bus, i); pe.input_b(b_val)")
+    call = _pe_call(decoded)
+    if call:
+        handler, args = call
+        lines.append(f"{handler}({args})" if vectorized else f"for handler in pe_{handler}: handler({args})")
+    return lines
+
+def _address(base : int, inc : int, index : str) -> str:
+    if inc == 0:
+        return str(base)
+    return f"{base} + {index}" if inc == 1 else f"{base} + {inc} * {index}"
+
+def _mac_blocks(program : list[DecodedInstruction]) -> list[list[DecodedInstruction]]:
+    # Splitting a Program into Runs of Consecutive READ+MAC Instructions with
+    # the Same Modes, and Single Other Instructions
+    blocks = []
+    for decoded in program:
+        previous = blocks[-1][-1] if blocks else None
+        if _is_mac_read(decoded) and previous is not None and _is_mac_read(previous) and \
+                (decoded.mem_mode, decoded.pe_mode) == (previous.mem_mode, previous.pe_mode):
+            blocks[-1].append(decoded)
+        else:
+            blocks.append([decoded])
+    return blocks
+
+def _is_mac_read(decoded : DecodedInstruction) -> bool:
+    return (decoded.mem_opcode == MI.READ) and (decoded.pe_opcode == PEI.NO_VALUE) and (decoded.pe_value == PEI.MAC)
+
+def _addresses(block : list[DecodedInstruction], offset : str, inc : str) -> list[int]:
+    return [getattr(decoded, offset) + k * getattr(decoded, inc) for decoded in block for k in range(decoded.count + 1)]
+
+def generate_source(program : list[DecodedInstruction], vectorized : bool, batched : bool = None) -> str:
+    # Address Arrays of Fused READ+MAC Blocks are Module Constants, Built Once.
+    # Batched Reads Need MEM1 Words of at Most 64 Bits.
+    batched = vectorized if batched is None else batched
+    constants = []
+    lines = [
+        "def kernel(buf, pes):",
+        "    read, write = buf._read, buf._write",
+    ]
+    if vectorized:
+        lines += [
+            "    write_port, mem0_row, mem1_word = buf.write_mem2_row, buf.read_mem0_row, buf.read_mem1_word",
+            "    input_a, input_b, out_row = pes.input_a_row, pes.input_b_word, pes.get_output_row",
+            "    mac, out, pass_, clr, rnd = pes._handle_mac, pes._handle_out, pes._handle_pass, pes._handle_clr, pes._handle_rnd",
+        ]
+    else:
+        lines += [
+            "    write_port, mem0_out, mem1_out = buf.write_mem2_output, buf.read_mem0_output, buf.read_mem1_output",
+            "    join = lambda: Bits().join([pe.get_output() for pe in pes])",
+        ]
+        lines += [f"    pe_{name} = [pe._handle_{name.rstrip('_')} for pe in pes]" for name in ["mac", "out", "pass_", "clr", "rnd"]]
+
+    number = 0
+    for block in _mac_blocks(program):
+        lines += [f"    # {number + k}: {decoded!r}" for k, decoded in enumerate(block)]
+        number += len(block)
+
+        # READ+MAC Blocks Longer than the Unroll Limit Become One Gather and MAC
+        # over Addresses Resolved Here
+        decoded = block[0]
+        iterations = sum(decoded.count + 1 for decoded in block)
+        if batched and _is_mac_read(decoded) and iterations > UNROLL_LIMIT:
+            if len(block) == 1:
+                lines.append(f"    a_rows, b_words = buf.read_run({decoded.mem_mode}, {decoded.mema_offset}, {decoded.mema_inc}, {decoded.memb_offset}, {decoded.memb_inc}, {iterations})")
+            else:
+                name = f"ADDRESSES_{len(constants)}"
+                constants.append(f"{name} = (np.array({_addresses(block, 'mema_offset', 'mema_inc')}), np.array({_addresses(block, 'memb_offset', 'memb_inc')}))")
+                lines.append(f"    a_rows, b_words = buf.read_rows({decoded.mem_mode}, *{name})")
+            lines.append(f"    pes.mac_run({decoded.pe_mode}, a_rows, b_words)")
+            continue
+
+        for decoded in block:
+            iterations = decoded.count + 1
+            if (decoded.mem_opcode == MI.NOP) and (decoded.pe_opcode == PEI.NO_VALUE) and (decoded.pe_value in _IDEMPOTENT):
+                iterations = 1
+            if iterations <= UNROLL_LIMIT:
+                for k in range(iterations):
+                    mema = decoded.mema_offset + k * decoded.mema_inc
+                    memb = decoded.memb_offset + k * decoded.memb_inc
+                    lines += [f"    {line}" for line in _iteration(decoded, vectorized, str(mema), str(memb))]
+            else:
+                body = _iteration(decoded, vectorized, _address(decoded.mema_offset, decoded.mema_inc, "k"), _address(decoded.memb_offset, decoded.memb_inc, "k"))
+                lines.append(f"    for k in range({iterations}):")
+                lines += [f"        {line}" for line in (body or ["pass"])]
+    lines.append("    return None")
+    return "\n".join(constants + lines) + "\n"
+
+def compile_program(config, program : list[DecodedInstruction], vectorized : bool = True) -> Kernel:
+    config.validate()
+    program = list(program)
+    batched = vectorized and (config.BUFFER_CONFIG.MEM1_BITWIDTH <= 64)
+    return Kernel(config, program, vectorized, generate_source(program, vectorized, batched))